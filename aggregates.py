@@ -0,0 +1,195 @@
+"""Precomputed summary statistics per region, prevalence bucket and year.
+
+The cube stores additive measures (row count, sum, area and area-weighted sum,
+min and max, and which countries occur) for every (region, bucket, year) cell.
+Summaries read a handful of cells, so their cost does not depend on the number
+of rows. New partitions are added to a copy of the previous cube instead of
+rebuilding it. Only a rewritten or removed partition causes a rebuild.
+"""
+import threading
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from data_store import PREVALENCE_DIR, _read_partition, _sample_frame, current_signatures
+from countries import country_ids, lookup
+from regions import REGION_ORDER, region_numbers
+
+BUCKET_WIDTH = 10
+BUCKETS = 10
+REGION_NAMES = ["All", *REGION_ORDER]
+# Cubes kept per directory: the current snapshot and the one being replaced
+CUBE_VERSIONS = 2
+# Optional per-row area column (sub-national rows); otherwise the country's area is used
+AREA_COLUMN = "area_km2"
+_MEASURES = ("count", "total", "area", "weighted_total", "minimum", "maximum")
+
+
+class AggregateCube:
+    def __init__(self):
+        # Year axis; data without a year column uses the single year ``None``
+        self.years = []
+        self.countries = []
+        self._year_index = {}
+        self._country_index = {}
+        shape = (len(REGION_NAMES), BUCKETS, 0)
+        self.count, self.total, self.area, self.weighted_total = (np.zeros(shape) for _ in range(4))
+        self.minimum = np.full(shape, np.inf)
+        self.maximum = np.full(shape, -np.inf)
+        self.present = np.zeros(shape + (0,), dtype=bool)
+
+    def copy(self):
+        cube = AggregateCube()
+        cube.years, cube.countries = list(self.years), list(self.countries)
+        cube._year_index, cube._country_index = dict(self._year_index), dict(self._country_index)
+        for name in (*_MEASURES, "present"):
+            setattr(cube, name, getattr(self, name).copy())
+        return cube
+
+    def _indices(self, keys, index, labels):
+        """Map ``keys`` to axis positions, appending unseen keys to ``labels``."""
+        uniques, inverse = np.unique(keys, return_inverse=True)
+        for key in uniques.tolist():
+            if key not in index:
+                index[key] = len(labels)
+                labels.append(key)
+        return np.array([index[key] for key in uniques.tolist()], dtype=np.int64)[inverse]
+
+    def _grow(self):
+        """Pad every array to the current number of years and countries."""
+        years, countries = len(self.years), len(self.countries)
+        for name in _MEASURES:
+            array = getattr(self, name)
+            fill = {"minimum": np.inf, "maximum": -np.inf}.get(name, 0.0)
+            setattr(self, name, np.pad(array, ((0, 0), (0, 0), (0, years - array.shape[2])), constant_values=fill))
+        pad = ((0, 0), (0, 0), (0, years - self.present.shape[2]), (0, countries - self.present.shape[3]))
+        self.present = np.pad(self.present, pad)
+
+    def add(self, frame):
+        """Fold the rows of ``frame`` (a prevalence or history table) into the cube."""
+        values = frame["slash_burn_prevalence"].to_numpy(dtype="float64")
+        valid = ~np.isnan(values)
+        values = values[valid]
+        codes = frame["country_code"].to_numpy()[valid].astype(str)
+        # Region numbers and areas come from the country dimension (an integer join)
+        ids = country_ids(frame["country_code"])[valid]
+        regions = region_numbers(frame["country_code"])[valid].astype(np.int64)
+        if AREA_COLUMN in frame.columns:
+            areas = frame[AREA_COLUMN].to_numpy(dtype="float64")[valid]
+        else:
+            areas = lookup(ids, "area_km2")
+        # Rows without a known area still count, they just carry no weight
+        areas = np.nan_to_num(areas)
+        if "year" in frame.columns:
+            years = self._indices(frame["year"].to_numpy()[valid], self._year_index, self.years)
+        else:
+            if None not in self._year_index:
+                self._year_index[None] = len(self.years)
+                self.years.append(None)
+            years = np.full(len(values), self._year_index[None], dtype=np.int64)
+        countries = self._indices(codes, self._country_index, self.countries)
+        self._grow()
+
+        buckets = np.clip(values // BUCKET_WIDTH, 0, BUCKETS - 1).astype(np.int64)
+        # Every row lands in the "All" cells and, if it has one, in its region's cells
+        in_region = regions > 0
+        for rows, region in ((slice(None), np.zeros_like(regions)), (in_region, regions)):
+            self._accumulate(region[rows], buckets[rows], years[rows], countries[rows], values[rows], areas[rows])
+
+    def _accumulate(self, region, bucket, year, country, value, area):
+        shape, size = self.count.shape, self.count.size
+        cells = np.ravel_multi_index((region, bucket, year), shape)
+        self.count += np.bincount(cells, minlength=size).reshape(shape)
+        self.total += np.bincount(cells, value, minlength=size).reshape(shape)
+        self.area += np.bincount(cells, area, minlength=size).reshape(shape)
+        self.weighted_total += np.bincount(cells, value * area, minlength=size).reshape(shape)
+        np.minimum.at(self.minimum.reshape(-1), cells, value)
+        np.maximum.at(self.maximum.reshape(-1), cells, value)
+        self.present[region, bucket, year, country] = True
+
+    def _cells(self, region, year, low=0, high=100):
+        """Return the index selecting ``region``'s buckets covering ``low..high`` in ``year``."""
+        first = min(int(low // BUCKET_WIDTH), BUCKETS - 1)
+        last = min(int(high // BUCKET_WIDTH), BUCKETS - 1)
+        return REGION_NAMES.index(region), slice(first, last + 1), self._year_index.get(year)
+
+    def summary(self, region, year=None, low=0, high=100):
+        """Return the statistics for ``region`` and ``year`` over whole buckets covering ``low..high``."""
+        region_index, buckets, year_index = self._cells(region, year, low, high)
+        if year_index is None:
+            return {"count": 0, "countries": 0, "mean": np.nan, "weighted_mean": np.nan, "min": np.nan, "max": np.nan}
+        cells = (region_index, buckets, year_index)
+        count = self.count[cells].sum()
+        area = self.area[cells].sum()
+        minimum, maximum = self.minimum[cells].min(), self.maximum[cells].max()
+        return {
+            "count": int(count),
+            "countries": int(self.present[cells].any(axis=0).sum()),
+            "mean": self.total[cells].sum() / count if count else np.nan,
+            "weighted_mean": self.weighted_total[cells].sum() / area if area else np.nan,
+            "min": minimum if count else np.nan,
+            "max": maximum if count else np.nan,
+        }
+
+    def bucket_summaries(self, region, year=None):
+        """Return one row of statistics per prevalence bucket for ``region`` and ``year``."""
+        rows = [
+            {
+                "bucket": f"{bucket * BUCKET_WIDTH}–{100 if bucket == BUCKETS - 1 else (bucket + 1) * BUCKET_WIDTH - 1}",
+                **self.summary(region, year, bucket * BUCKET_WIDTH, bucket * BUCKET_WIDTH),
+            }
+            for bucket in range(BUCKETS)
+        ]
+        return pd.DataFrame(rows)
+
+
+@st.cache_resource(show_spinner=False)
+def _cube_registry():
+    # directory -> {partition signatures: cube built from them}, most recent last
+    return {}, threading.Lock()
+
+
+def load_cube(directory=PREVALENCE_DIR, signatures=None):
+    """Return the shared cube for the partitions in ``directory`` (or ``signatures``).
+
+    When partitions were only added since a cached cube was built, that cube is
+    copied and just the new partitions are folded in. Cubes are never changed
+    after they are returned, and the last ``CUBE_VERSIONS`` are kept, so
+    sessions still on an older snapshot keep reading theirs.
+    """
+    if signatures is None:
+        signatures = current_signatures(directory)
+    registry, lock = _cube_registry()
+    # The lock only guards the registry; builds run outside it, so a session
+    # reading a cached cube never waits for another snapshot's build
+    with lock:
+        versions = registry.setdefault(str(directory), {})
+        if signatures in versions:
+            return versions[signatures]
+        # Start from the newest cube whose partitions are all still unchanged
+        base = next(
+            (known for known in reversed(versions) if known and set(known) <= set(signatures)), None
+        )
+        base_cube = versions[base] if base is not None else None
+
+    if base_cube is not None:
+        cube = base_cube.copy()
+        new = [signature for signature in signatures if signature not in set(base)]
+    else:
+        cube = AggregateCube()
+        new = signatures
+    for signature in new:
+        table = _read_partition(*signature)
+        columns = [name for name in ("country_code", "year", "slash_burn_prevalence", AREA_COLUMN)
+                   if name in table.column_names]
+        cube.add(table.select(columns).to_pandas(categories=["country_code"]))
+    if not signatures:
+        cube.add(_sample_frame())
+
+    with lock:
+        # Another thread may have built the same version meanwhile; keep the first
+        cube = versions.setdefault(signatures, cube)
+        while len(versions) > CUBE_VERSIONS:
+            del versions[next(iter(versions))]
+        return cube
@@ -0,0 +1,180 @@
+"""Headless benchmarks for app.py and streamlit-slash-burn-map.py.
+
+Drives both entry points with Streamlit's AppTest on synthetic prevalence
+datasets and measures cold start, the remaining background warm-up, page
+renders and Map interactions (region changes, slider moves, the "Show raw
+data" toggle and download preparation).
+Every entry point and dataset size runs in a fresh interpreter, so cold starts
+are real and the shared caches start empty.
+
+Results are compared against bench/baselines.json; a metric that is slower than
+its baseline by more than the threshold fails the run. Baselines are machine
+specific, so regenerate them on the machine you compare on.
+
+Usage:
+    python bench/benchmark.py                      # run and compare
+    python bench/benchmark.py --update-baselines   # run and store as baselines
+    python bench/benchmark.py --sizes 40 10000 --threshold 0.5
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from data_store import SAMPLE_DATA, write_partition  # noqa: E402
+
+ENTRY_POINTS = ["app.py", "streamlit-slash-burn-map.py"]
+PAGES = ["About", "Environmental Effects", "Sustainable Solutions", "Implementation", "SDG Alignment", "Map"]
+REGION_CYCLE = ["Africa", "Asia", "South America", "Europe", "All"]
+RANGE_CYCLE = [(10, 90), (25, 75), (40, 60), (0, 100)]
+DEFAULT_SIZES = [40, 10_000, 1_000_000]
+BASELINES = Path(__file__).with_name("baselines.json")
+# Differences below this many milliseconds are treated as noise
+MIN_DELTA_MS = 5.0
+APP_TIMEOUT = 600
+
+
+def synthetic_dataset(rows, seed=0):
+    """Return ``rows`` prevalence rows spread over the sample countries (sub-national style)."""
+    rng = np.random.default_rng(seed)
+    sample = pd.DataFrame(SAMPLE_DATA)
+    picks = np.arange(rows) % len(sample)
+    df = sample.iloc[picks].reset_index(drop=True)
+    if rows > len(sample):
+        df["slash_burn_prevalence"] = rng.integers(0, 101, rows)
+    return df
+
+
+def timed(action):
+    start = time.perf_counter()
+    action()
+    return round((time.perf_counter() - start) * 1000, 1)
+
+
+def cycle(action, values, repeat):
+    """Median time of ``action(value)`` over ``repeat`` steps through ``values``."""
+    return statistics.median_low(timed(lambda: action(values[i % len(values)])) for i in range(repeat))
+
+
+def widget(elements, label):
+    return next(element for element in elements if element.label == label)
+
+
+def bench_entry_point(script, repeat):
+    from streamlit.testing.v1 import AppTest
+
+    from export import EXPORT_FORMATS, export_bytes
+
+    import warmup
+
+    results = {}
+    at = AppTest.from_file(str(ROOT / script), default_timeout=APP_TIMEOUT)
+    results["cold_start"] = timed(at.run)
+    # Interactions are measured once the background warm-up is done, as most users see them
+    results["warmup"] = timed(lambda: warmup.start().finished.wait(APP_TIMEOUT))
+
+    if script == "app.py":
+        navigation = widget(at.radio, "Go to")
+        for page in PAGES:
+            results[f"page:{page}"] = timed(lambda: navigation.set_value(page).run())
+            navigation = widget(at.radio, "Go to")
+
+    results["region_change"] = cycle(
+        lambda region: at.selectbox(key="map_region").select(region).run(), REGION_CYCLE, repeat
+    )
+    results["slider_move"] = cycle(
+        lambda value: at.slider(key="map_prevalence").set_value(value).run(), RANGE_CYCLE, repeat
+    )
+    results["raw_data_toggle"] = cycle(
+        lambda checked: widget(at.checkbox, "Show raw data").set_value(checked).run(), [True, False], repeat
+    )
+
+    # AppTest can't click a download button, so time the callable it would run
+    from data_store import load_data
+
+    df = load_data()
+    positions = np.arange(len(df))
+    for export_format in EXPORT_FORMATS:
+        results[f"download:{export_format}"] = timed(lambda: export_bytes(df, positions, export_format))
+
+    if at.exception:
+        raise RuntimeError(f"{script} raised: {at.exception[0].value}")
+    return results
+
+
+def run_size(rows, repeat):
+    """Benchmark every entry point, each in its own interpreter, on ``rows`` rows."""
+    results = {}
+    with tempfile.TemporaryDirectory() as data_dir:
+        write_partition(synthetic_dataset(rows), "synthetic", Path(data_dir) / "prevalence")
+        for script in ENTRY_POINTS:
+            output = subprocess.run(
+                [sys.executable, __file__, "--child", script, "--repeat", str(repeat)],
+                env={**os.environ, "SLASH_BURN_DATA_DIR": data_dir},
+                cwd=ROOT,
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stdout
+            results[script] = json.loads(output.strip().splitlines()[-1])
+    return results
+
+
+def compare(results, baselines, threshold):
+    """Print every metric next to its baseline and return the regressions."""
+    regressions = []
+    for size, scripts in results.items():
+        for script, metrics in scripts.items():
+            for metric, ms in metrics.items():
+                baseline = baselines.get(size, {}).get(script, {}).get(metric)
+                status = ""
+                if baseline is not None:
+                    ratio = ms / baseline if baseline else float("inf")
+                    status = f"{ratio:6.2f}x"
+                    if ms > baseline * (1 + threshold) and ms - baseline > MIN_DELTA_MS:
+                        status += "  REGRESSION"
+                        regressions.append((size, script, metric, baseline, ms))
+                print(f"{size:>8} {script:<30} {metric:<28} {ms:10.1f} ms  {status}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless benchmarks for the slash-and-burn app")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="dataset sizes in rows")
+    parser.add_argument("--repeat", type=int, default=5, help="samples per interaction")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown (0.25 = 25%%)")
+    parser.add_argument("--update-baselines", action="store_true")
+    parser.add_argument("--child", metavar="SCRIPT", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        # Benchmark one entry point against the dataset in SLASH_BURN_DATA_DIR
+        print(json.dumps(bench_entry_point(args.child, args.repeat)))
+        return
+
+    results = {str(rows): run_size(rows, args.repeat) for rows in args.sizes}
+    baselines = json.loads(BASELINES.read_text()) if BASELINES.exists() else {}
+    regressions = compare(results, baselines, args.threshold)
+
+    if args.update_baselines:
+        baselines.update(results)
+        BASELINES.write_text(json.dumps(baselines, indent=2, sort_keys=True) + "\n")
+        print(f"Updated {BASELINES}")
+    elif regressions:
+        print(f"{len(regressions)} metric(s) regressed by more than {args.threshold:.0%}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+"""Local load test: many concurrent browser-like sessions against one server.
+
+Starts ``streamlit run`` on a free port and opens N websocket sessions that
+speak Streamlit's protocol directly (protobuf BackMsg/ForwardMsg), so no
+browser is needed. Every session replays an interaction script of page
+switches, region changes and slider drags, sending widget states the way the
+frontend does (fragment widgets only rerun their fragment). For each session
+count it reports p50/p95/p99 rerun latency, throughput and the server's RSS.
+
+Usage:
+    python bench/load_test.py --sessions 1 10 25 50 --rounds 3
+    python bench/load_test.py --script streamlit-slash-burn-map.py
+"""
+import argparse
+import asyncio
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+from pathlib import Path
+
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+from websockets.asyncio.client import connect
+from websockets.exceptions import ConnectionClosed
+
+ROOT = Path(__file__).resolve().parent.parent
+WIDGET_TYPES = ("radio", "selectbox", "slider", "checkbox", "toggle")
+
+# (widget label, value) steps; a list of values is a drag sent as quick updates
+INTERACTION_SCRIPT = [
+    ("Go to", "About"),
+    ("Go to", "Map"),
+    ("Select Region", "Africa"),
+    ("Prevalence range", [(5, 100), (15, 100), (25, 100), (25, 90), (25, 80)]),
+    ("Select Region", "Asia"),
+    ("Prevalence range", [(20, 80), (10, 80), (0, 100)]),
+    ("Go to", "SDG Alignment"),
+    ("Go to", "Map"),
+    ("Select Region", "All"),
+]
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))]
+
+
+def server_rss_bytes(pid):
+    """Resident set size of ``pid`` (Linux /proc, with psutil as a fallback)."""
+    try:
+        with open(f"/proc/{pid}/status") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    try:
+        import psutil
+    except ImportError:
+        return None
+    return psutil.Process(pid).memory_info().rss
+
+
+class Session:
+    """One browser tab: a websocket plus the widget states the frontend would hold."""
+
+    def __init__(self, url):
+        self.url = url
+        self.widgets = {}  # label -> (element type, widget id, fragment id)
+        self.states = {}  # widget id -> WidgetState
+        self.page_script_hash = ""
+
+    async def connect(self):
+        self.connection = await connect(self.url, max_size=None)
+
+    async def rerun(self, fragment_id=""):
+        """Send a rerun with the current widget states; return its latency in seconds."""
+        message = BackMsg()
+        client_state = message.rerun_script
+        client_state.page_script_hash = self.page_script_hash
+        client_state.fragment_id = fragment_id
+        client_state.widget_states.widgets.extend(self.states.values())
+        start = time.perf_counter()
+        await self.connection.send(message.SerializeToString())
+        while True:
+            try:
+                data = await self.connection.recv()
+            except ConnectionClosed as error:
+                raise ConnectionError("server closed the session") from error
+            forward = ForwardMsg()
+            forward.ParseFromString(data)
+            kind = forward.WhichOneof("type")
+            if kind == "new_session":
+                self.page_script_hash = forward.new_session.page_script_hash
+            elif kind == "delta" and forward.delta.WhichOneof("type") == "new_element":
+                self._remember_widget(forward.delta)
+            elif kind == "script_finished":
+                return time.perf_counter() - start
+
+    def _remember_widget(self, delta):
+        element = delta.new_element
+        kind = element.WhichOneof("type")
+        if kind in WIDGET_TYPES:
+            widget = getattr(element, kind)
+            self.widgets[widget.label] = (kind, widget.id, delta.fragment_id)
+
+    async def interact(self, label, value):
+        """Set widget ``label`` to ``value`` and rerun; return the latency in seconds."""
+        kind, widget_id, fragment_id = self.widgets[label]
+        state = WidgetState(id=widget_id)
+        if kind == "slider":
+            state.double_array_value.data[:] = list(value)
+        elif kind in ("checkbox", "toggle"):
+            state.bool_value = value
+        else:
+            state.string_value = value
+        self.states[widget_id] = state
+        return await self.rerun(fragment_id)
+
+    async def close(self):
+        await self.connection.close()
+
+
+async def run_session(url, steps, rounds, think_time, latencies):
+    session = Session(url)
+    await session.connect()
+    latencies.append(await session.rerun())
+    for _ in range(rounds):
+        for label, value in steps:
+            # A drag sends several values in quick succession, without think time
+            for step in value if isinstance(value, list) else [value]:
+                latencies.append(await session.interact(label, step))
+            await asyncio.sleep(random.uniform(0, think_time))
+    await session.close()
+
+
+async def run_level(url, pid, steps, sessions, rounds, think_time):
+    latencies = []
+    peak_rss = server_rss_bytes(pid)
+
+    async def sample_rss():
+        nonlocal peak_rss
+        while True:
+            peak_rss = max(peak_rss or 0, server_rss_bytes(pid) or 0)
+            await asyncio.sleep(0.2)
+
+    sampler = asyncio.ensure_future(sample_rss())
+    start = time.perf_counter()
+    await asyncio.gather(*(run_session(url, steps, rounds, think_time, latencies) for _ in range(sessions)))
+    elapsed = time.perf_counter() - start
+    sampler.cancel()
+    return {
+        "sessions": sessions,
+        "reruns": len(latencies),
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "throughput": len(latencies) / elapsed,
+        "peak_rss_mb": peak_rss / 2**20 if peak_rss else float("nan"),
+    }
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def wait_until_healthy(port, timeout=60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            await asyncio.to_thread(urllib.request.urlopen, f"http://127.0.0.1:{port}/_stcore/health")
+            return
+        except OSError:
+            await asyncio.sleep(0.25)
+    raise TimeoutError("streamlit server did not become healthy")
+
+
+def start_server(script, port):
+    return subprocess.Popen(
+        [
+            sys.executable, "-m", "streamlit", "run", str(ROOT / script),
+            "--server.headless", "true",
+            "--server.port", str(port),
+            "--server.enableXsrfProtection", "false",
+            "--browser.gatherUsageStats", "false",
+        ],
+        cwd=ROOT,
+        env=os.environ.copy(),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+
+async def main_async(args):
+    steps = INTERACTION_SCRIPT
+    if args.script != "app.py":
+        # The standalone map has no navigation, so skip the page switches
+        steps = [step for step in steps if step[0] != "Go to"]
+    port = free_port()
+    server = start_server(args.script, port)
+    try:
+        await wait_until_healthy(port)
+        url = f"ws://127.0.0.1:{port}/_stcore/stream"
+        idle_rss = server_rss_bytes(server.pid)
+        print(f"server pid {server.pid}, idle RSS {idle_rss / 2**20 if idle_rss else float('nan'):.0f} MB")
+        print(f"{'sessions':>8}{'reruns':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'reruns/s':>10}{'RSS MB':>9}{'MB/session':>12}")
+        for sessions in args.sessions:
+            result = await run_level(url, server.pid, steps, sessions, args.rounds, args.think_time)
+            per_session = (result["peak_rss_mb"] - idle_rss / 2**20) / sessions if idle_rss else float("nan")
+            print(
+                f"{result['sessions']:>8}{result['reruns']:>8}{result['p50_ms']:>10.1f}{result['p95_ms']:>10.1f}"
+                f"{result['p99_ms']:>10.1f}{result['throughput']:>10.1f}{result['peak_rss_mb']:>9.0f}{per_session:>12.2f}"
+            )
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent-session load test for the slash-and-burn app")
+    parser.add_argument("--script", default="app.py", help="entry point to serve")
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 10, 25, 50], help="session counts to test")
+    parser.add_argument("--rounds", type=int, default=3, help="times each session replays the script")
+    parser.add_argument("--think-time", type=float, default=0.5, help="max seconds between interactions")
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
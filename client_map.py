@@ -0,0 +1,199 @@
+"""Client-side filtering mode for the Map page.
+
+Ships the full dataset to the browser once, inside a self-contained HTML
+component. The region and threshold controls live in the component and filter
+by restyling the existing choropleth trace with plotly.js, so moving a slider
+never reruns the Streamlit script.
+
+The year animation works the same way: it ships one base frame plus per-year
+deltas and replays them in the browser.
+"""
+import json
+
+import pandas as pd
+import plotly.io as pio
+import streamlit as st
+import streamlit.components.v1 as components
+
+from map_figure import build_map_figure
+from regions import REGION_OPTIONS, REGIONS
+from timeseries import delta_frames
+
+CLIENT_MAP_HEIGHT = 640
+
+CONTROLS_HTML = """
+<style>
+  body {{ font-family: "Source Sans Pro", sans-serif; margin: 0; }}
+  .controls {{ display: flex; gap: 1.5rem; align-items: center; flex-wrap: wrap; padding: 0.25rem 0; }}
+  .controls label {{ font-size: 0.9rem; }}
+</style>
+<div class="controls">
+  <label>Select Region <select id="region">{options}</select></label>
+  <label>Minimum Prevalence <input id="min" type="range" min="0" max="100" value="0">
+    <span id="min-value">0</span></label>
+  <label>Maximum Prevalence <input id="max" type="range" min="0" max="100" value="100">
+    <span id="max-value">100</span></label>
+  <span id="count"></span>
+</div>
+"""
+
+# Runs after plotly.js has drawn the figure; {plot_id} is filled in by plotly
+FILTER_SCRIPT = """
+const rows = __ROWS__;
+const regions = __REGIONS__;
+const plot = document.getElementById("{plot_id}");
+const controls = ["region", "min", "max"].map((id) => document.getElementById(id));
+
+function applyFilters() {
+    const [region, min, max] = controls.map((control) => control.value);
+    document.getElementById("min-value").textContent = min;
+    document.getElementById("max-value").textContent = max;
+    const codes = region === "All" ? null : new Set(regions[region]);
+    const locations = [], z = [], hovertext = [];
+    for (let i = 0; i < rows.codes.length; i++) {
+        const value = rows.values[i];
+        if (value < +min || value > +max || (codes && !codes.has(rows.codes[i]))) continue;
+        locations.push(rows.codes[i]);
+        z.push(value);
+        hovertext.push(rows.names[i]);
+    }
+    Plotly.restyle(plot, {locations: [locations], z: [z], hovertext: [hovertext]}, [0]);
+    document.getElementById("count").textContent = locations.length + " countries";
+}
+
+controls.forEach((control) => control.addEventListener("input", applyFilters));
+applyFilters();
+"""
+
+ANIMATION_CONTROLS_HTML = """
+<style>
+  body { font-family: "Source Sans Pro", sans-serif; margin: 0; }
+  .controls { display: flex; gap: 1rem; align-items: center; padding: 0.25rem 0; }
+  .controls input { flex: 1; }
+</style>
+<div class="controls">
+  <button id="play">Play</button>
+  <input id="year" type="range" min="0" value="0">
+  <strong id="year-value"></strong>
+</div>
+"""
+
+ANIMATION_SCRIPT = """
+const frames = __FRAMES__;
+const plot = document.getElementById("{plot_id}");
+const slider = document.getElementById("year");
+const button = document.getElementById("play");
+let z = frames.base.slice();
+let current = 0;
+let timer = null;
+
+// Rebuild the values for a year by replaying the deltas since the base frame
+function seek(index) {
+    if (index < current) {
+        z = frames.base.slice();
+        current = 0;
+    }
+    for (; current < index; current++) {
+        for (const [row, value] of frames.deltas[current]) z[row] = value;
+    }
+    slider.value = index;
+    document.getElementById("year-value").textContent = frames.years[index];
+    Plotly.restyle(plot, {z: [z]}, [0]);
+}
+
+function togglePlay() {
+    if (timer) {
+        clearInterval(timer);
+        timer = null;
+        button.textContent = "Play";
+    } else {
+        timer = setInterval(() => seek((current + 1) % frames.years.length), 400);
+        button.textContent = "Pause";
+    }
+}
+
+slider.max = frames.years.length - 1;
+slider.addEventListener("input", () => seek(+slider.value));
+button.addEventListener("click", togglePlay);
+seek(0);
+"""
+
+
+def _script_json(value):
+    # Keep "</script>" inside the data from closing the script element
+    return json.dumps(value).replace("</", "<\\/")
+
+
+def client_map_html(df, include_plotlyjs="cdn"):
+    """Return a standalone HTML fragment with the map and its in-browser filters.
+
+    ``include_plotlyjs`` is passed to ``plotly.io.to_html``: ``"cdn"`` loads
+    plotly.js from the CDN, ``True`` inlines it for fully offline pages.
+    """
+    rows = {
+        "codes": df["country_code"].tolist(),
+        "names": df["country_name"].tolist(),
+        "values": df["slash_burn_prevalence"].tolist(),
+    }
+    script = (
+        FILTER_SCRIPT
+        .replace("__ROWS__", _script_json(rows))
+        .replace("__REGIONS__", _script_json(REGIONS))
+    )
+    options = "".join(f"<option>{region}</option>" for region in REGION_OPTIONS)
+    figure_html = pio.to_html(
+        build_map_figure(df),
+        include_plotlyjs=include_plotlyjs,
+        full_html=False,
+        post_script=script,
+        default_height=f"{CLIENT_MAP_HEIGHT - 60}px",
+        config={"responsive": True},
+    )
+    return CONTROLS_HTML.format(options=options) + figure_html
+
+
+def client_animation_html(ts, include_plotlyjs="cdn"):
+    """Return a standalone HTML fragment animating the prevalence history by year."""
+    frames = delta_frames(ts)
+    base = pd.DataFrame({
+        "country_code": frames["codes"],
+        "country_name": frames["names"],
+        "slash_burn_prevalence": frames["base"],
+    })
+    script = ANIMATION_SCRIPT.replace("__FRAMES__", _script_json(frames))
+    figure_html = pio.to_html(
+        build_map_figure(base),
+        include_plotlyjs=include_plotlyjs,
+        full_html=False,
+        post_script=script,
+        default_height=f"{CLIENT_MAP_HEIGHT - 60}px",
+        config={"responsive": True},
+    )
+    return ANIMATION_CONTROLS_HTML + figure_html
+
+
+def _show_html(html):
+    if hasattr(st, "iframe"):
+        st.iframe(html, height=CLIENT_MAP_HEIGHT)
+    else:  # Streamlit releases before st.iframe
+        components.html(html, height=CLIENT_MAP_HEIGHT)
+
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+def _cached_client_map_html(version, _df):
+    return client_map_html(_df)
+
+
+def render_client_map(df):
+    """Show the client-side filtered map; the HTML is built once per dataset version."""
+    _show_html(_cached_client_map_html(df.attrs.get("version"), df))
+
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+def _cached_client_animation_html(version, _ts):
+    return client_animation_html(_ts)
+
+
+def render_client_animation(ts):
+    """Show the year animation; frames are encoded once per dataset version."""
+    _show_html(_cached_client_animation_html(ts.attrs.get("version"), ts))
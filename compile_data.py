@@ -0,0 +1,204 @@
+"""Validate incoming prevalence files and compile them into app partitions.
+
+Large CSV, Parquet or Arrow files are read in fixed-size chunks, and every
+check runs on whole columns at a time:
+
+- ``country_code`` must be an ISO-3 code of the country dimension table (the
+  codes the choropleth can draw);
+- ``slash_burn_prevalence`` must be a number in [0, 100];
+- ``year`` (if present) must be a whole number;
+- a (country, year) key may appear only once, across all chunks and files
+  (the key is ``admin_code`` instead of the country for sub-national data);
+- rows of countries without a region, and regions without any rows, are
+  reported, since the region filter can never show them.
+
+Rejected rows are counted per check and left out. The clean rows are written
+as one uncompressed Arrow IPC partition, which the app memory-maps as-is. The
+rows are sorted by prevalence (within each year for a history), so that
+sort order already is the filter index's value index and loading the
+partition doesn't sort anything. The country columns are stored dictionary
+encoded, so they load as categoricals without a conversion pass.
+
+Usage:
+    python compile_data.py prevalence.csv
+    python compile_data.py history_*.parquet --name history   # files with a year column
+"""
+import argparse
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+
+from countries import COUNTRIES, country_ids
+from data_store import CATEGORICAL_COLUMNS, PREVALENCE_DIR, TIMESERIES_DIR, read_table, write_partition
+from geometry import ADMIN_CODE_COLUMN
+from regions import REGION_ORDER, region_numbers
+
+CHUNK_ROWS = 1_000_000
+CODE_COLUMN = "country_code"
+NAME_COLUMN = "country_name"
+VALUE_COLUMN = "slash_burn_prevalence"
+YEAR_COLUMN = "year"
+PREVALENCE_RANGE = (0, 100)
+# Offending values listed per check in the report
+MAX_EXAMPLES = 5
+
+
+def read_chunks(path, chunk_rows=CHUNK_ROWS):
+    """Yield the rows of a CSV, Parquet or Arrow file as DataFrames of at most ``chunk_rows`` rows."""
+    name = str(path)
+    if name.endswith(".parquet"):
+        for batch in pq.ParquetFile(name).iter_batches(batch_size=chunk_rows):
+            yield batch.to_pandas()
+    elif name.endswith(".arrow"):
+        # Memory-mapped, so only the current batch is materialized
+        for batch in read_table(name).to_batches(max_chunksize=chunk_rows):
+            yield batch.to_pandas()
+    else:
+        text_columns = {CODE_COLUMN: str, NAME_COLUMN: str, ADMIN_CODE_COLUMN: str}
+        with pd.read_csv(name, dtype=text_columns, chunksize=chunk_rows) as reader:
+            yield from reader
+
+
+class ValidationReport:
+    """Row counts per check, with a few offending values for each."""
+
+    def __init__(self):
+        self.rows = 0
+        self.kept = 0
+        self.rejected = {}
+        self.examples = {}
+        self.no_region = 0
+        self.no_region_codes = set()
+        self.region_rows = np.zeros(len(REGION_ORDER) + 1, dtype=np.int64)
+
+    def reject(self, check, mask, values):
+        count = int(mask.sum())
+        if count:
+            self.rejected[check] = self.rejected.get(check, 0) + count
+            examples = self.examples.setdefault(check, set())
+            if len(examples) < MAX_EXAMPLES:
+                examples.update(pd.unique(values[mask])[:MAX_EXAMPLES - len(examples)].tolist())
+
+    def lines(self):
+        lines = [f"Read {self.rows:,} rows, kept {self.kept:,}"]
+        for check, count in self.rejected.items():
+            examples = ", ".join(map(str, sorted(self.examples[check], key=str)))
+            lines.append(f"rejected {count:,} rows: {check} (e.g. {examples})")
+        if self.no_region:
+            codes = ", ".join(sorted(self.no_region_codes))
+            lines.append(f"warning: {self.no_region:,} rows of countries without a region ({codes})")
+        for region, count in zip(REGION_ORDER, self.region_rows[1:]):
+            if not count:
+                lines.append(f"warning: no rows for {region}")
+        return lines
+
+
+class Validator:
+    """Validates chunks one at a time, remembering the keys seen in earlier chunks."""
+
+    def __init__(self):
+        self.report = ValidationReport()
+        # Sorted 64-bit hashes of the (country or admin area, year) keys kept so far
+        self.seen_keys = np.empty(0, dtype=np.uint64)
+
+    def validate(self, chunk):
+        """Return the valid rows of ``chunk``, normalized; the rest are counted in ``report``."""
+        missing = [column for column in (CODE_COLUMN, VALUE_COLUMN) if column not in chunk.columns]
+        if missing:
+            raise ValueError(f"missing required columns: {', '.join(missing)}")
+        report = self.report
+        report.rows += len(chunk)
+
+        codes = chunk[CODE_COLUMN].astype(str).str.strip().str.upper()
+        ids = country_ids(codes)
+        values = pd.to_numeric(chunk[VALUE_COLUMN], errors="coerce").to_numpy(dtype="float64")
+        low, high = PREVALENCE_RANGE
+        # Every row is counted once, under the first check it fails
+        bad = ids < 0
+        report.reject("unknown ISO-3 code", bad, chunk[CODE_COLUMN].to_numpy())
+        out_of_range = ~bad & ~((values >= low) & (values <= high))
+        report.reject(f"prevalence not a number in [{low}, {high}]", out_of_range, chunk[VALUE_COLUMN].to_numpy())
+        bad |= out_of_range
+
+        clean = pd.DataFrame({CODE_COLUMN: codes.to_numpy(), VALUE_COLUMN: values})
+        key = pd.DataFrame({"code": codes.to_numpy()})
+        if ADMIN_CODE_COLUMN in chunk.columns:
+            clean[ADMIN_CODE_COLUMN] = key["code"] = chunk[ADMIN_CODE_COLUMN].to_numpy()
+        if YEAR_COLUMN in chunk.columns:
+            years = pd.to_numeric(chunk[YEAR_COLUMN], errors="coerce").to_numpy(dtype="float64")
+            bad_year = ~bad & ~(np.isfinite(years) & (years == np.round(years)))
+            report.reject("year not a whole number", bad_year, chunk[YEAR_COLUMN].to_numpy())
+            bad |= bad_year
+            clean[YEAR_COLUMN] = key[YEAR_COLUMN] = np.where(bad, 0, years).astype(np.int32)
+
+        # Duplicates of an earlier chunk's key, or of an earlier row in this one
+        hashes = pd.util.hash_pandas_object(key, index=False).to_numpy()
+        duplicate = ~bad & np.isin(hashes, self.seen_keys)
+        duplicate[~bad] |= pd.Series(hashes[~bad]).duplicated().to_numpy()
+        report.reject("duplicate (country, year) key", duplicate, key["code"].to_numpy())
+        bad |= duplicate
+        self.seen_keys = np.union1d(self.seen_keys, hashes[~bad])
+
+        ok = ~bad
+        clean = clean[ok].reset_index(drop=True)
+        # Names come from the input where given, otherwise from the dimension table
+        names = COUNTRIES["name"].to_numpy()[ids[ok]]
+        if NAME_COLUMN in chunk.columns:
+            given = chunk[NAME_COLUMN].to_numpy()[ok]
+            names = np.where(pd.isna(given), names, given)
+        clean.insert(1, NAME_COLUMN, names)
+
+        regions = region_numbers(clean[CODE_COLUMN])
+        no_region = regions == 0
+        report.no_region += int(no_region.sum())
+        report.no_region_codes.update(pd.unique(clean[CODE_COLUMN].to_numpy()[no_region]).tolist())
+        report.region_rows += np.bincount(regions, minlength=len(report.region_rows))
+        report.kept += len(clean)
+        return clean
+
+
+def compile_files(paths, name, directory=None, chunk_rows=CHUNK_ROWS, strict=False):
+    """Validate ``paths`` and write the clean rows as partition ``name``.
+
+    Files with a ``year`` column go to the history directory and the others to
+    the current-prevalence directory, unless ``directory`` is given. Returns
+    ``(path, report)``. Raises ``ValueError`` if no row is valid, or with
+    ``strict`` if any row was rejected; nothing is written then.
+    """
+    validator = Validator()
+    chunks = [validator.validate(chunk) for path in paths for chunk in read_chunks(path, chunk_rows)]
+    report = validator.report
+    if strict and report.rejected:
+        raise ValueError("\n".join(report.lines()))
+    df = pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame()
+    if df.empty:
+        raise ValueError("\n".join(["no valid rows", *report.lines()]))
+
+    history = YEAR_COLUMN in df.columns
+    order = [YEAR_COLUMN, VALUE_COLUMN] if history else [VALUE_COLUMN]
+    df = df.sort_values(order, kind="stable", ignore_index=True)
+    df = df.astype({column: "category" for column in CATEGORICAL_COLUMNS})
+    if directory is None:
+        directory = TIMESERIES_DIR if history else PREVALENCE_DIR
+    return write_partition(df, name, directory), report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("paths", nargs="+", help="CSV, Parquet or Arrow files")
+    parser.add_argument("--name", default="prevalence", help="partition name (default: %(default)s)")
+    parser.add_argument("--directory", help="output directory (default: by whether there is a year column)")
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS)
+    parser.add_argument("--strict", action="store_true", help="write nothing if any row is rejected")
+    args = parser.parse_args()
+    try:
+        path, report = compile_files(args.paths, args.name, args.directory, args.chunk_rows, args.strict)
+    except ValueError as error:
+        parser.exit(1, f"{error}\n")
+    print("\n".join(report.lines()))
+    print(f"Wrote {path}")
+
+
+if __name__ == "__main__":
+    main()
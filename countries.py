@@ -0,0 +1,217 @@
+"""ISO 3166-1 country dimension table.
+
+One row per country or territory (249), with its continent and UN M49
+subregion as categoricals. Rows are sorted by ISO-3 code and a country's
+integer id is its row number. Fact tables join on those ids rather than on
+strings: a categorical ``country_code`` column is resolved once per category,
+and every row after that is an integer lookup.
+"""
+import numpy as np
+import pandas as pd
+
+# (continent, subregion) -> [(ISO-3 code, name)]; the Americas are split into North and South
+_COUNTRIES_BY_SUBREGION = {
+    ("Africa", "Northern Africa"): [
+        ("DZA", "Algeria"), ("EGY", "Egypt"), ("LBY", "Libya"), ("MAR", "Morocco"), ("SDN", "Sudan"),
+        ("TUN", "Tunisia"), ("ESH", "Western Sahara"),
+    ],
+    ("Africa", "Eastern Africa"): [
+        ("IOT", "British Indian Ocean Territory"), ("BDI", "Burundi"), ("COM", "Comoros"), ("DJI", "Djibouti"),
+        ("ERI", "Eritrea"), ("ETH", "Ethiopia"), ("ATF", "French Southern Territories"), ("KEN", "Kenya"),
+        ("MDG", "Madagascar"), ("MWI", "Malawi"), ("MUS", "Mauritius"), ("MYT", "Mayotte"), ("MOZ", "Mozambique"),
+        ("REU", "Réunion"), ("RWA", "Rwanda"), ("SYC", "Seychelles"), ("SOM", "Somalia"), ("SSD", "South Sudan"),
+        ("UGA", "Uganda"), ("TZA", "Tanzania"), ("ZMB", "Zambia"), ("ZWE", "Zimbabwe"),
+    ],
+    ("Africa", "Middle Africa"): [
+        ("AGO", "Angola"), ("CMR", "Cameroon"), ("CAF", "Central African Republic"), ("TCD", "Chad"),
+        ("COG", "Congo"), ("COD", "DR Congo"), ("GNQ", "Equatorial Guinea"), ("GAB", "Gabon"),
+        ("STP", "Sao Tome and Principe"),
+    ],
+    ("Africa", "Southern Africa"): [
+        ("BWA", "Botswana"), ("SWZ", "Eswatini"), ("LSO", "Lesotho"), ("NAM", "Namibia"), ("ZAF", "South Africa"),
+    ],
+    ("Africa", "Western Africa"): [
+        ("BEN", "Benin"), ("BFA", "Burkina Faso"), ("CPV", "Cabo Verde"), ("CIV", "Côte d'Ivoire"),
+        ("GMB", "Gambia"), ("GHA", "Ghana"), ("GIN", "Guinea"), ("GNB", "Guinea-Bissau"), ("LBR", "Liberia"),
+        ("MLI", "Mali"), ("MRT", "Mauritania"), ("NER", "Niger"), ("NGA", "Nigeria"), ("SHN", "Saint Helena"),
+        ("SEN", "Senegal"), ("SLE", "Sierra Leone"), ("TGO", "Togo"),
+    ],
+    ("North America", "Caribbean"): [
+        ("AIA", "Anguilla"), ("ATG", "Antigua and Barbuda"), ("ABW", "Aruba"), ("BHS", "Bahamas"),
+        ("BRB", "Barbados"), ("BES", "Bonaire, Sint Eustatius and Saba"), ("VGB", "British Virgin Islands"),
+        ("CYM", "Cayman Islands"), ("CUB", "Cuba"), ("CUW", "Curaçao"), ("DMA", "Dominica"),
+        ("DOM", "Dominican Republic"), ("GRD", "Grenada"), ("GLP", "Guadeloupe"), ("HTI", "Haiti"),
+        ("JAM", "Jamaica"), ("MTQ", "Martinique"), ("MSR", "Montserrat"), ("PRI", "Puerto Rico"),
+        ("BLM", "Saint Barthélemy"), ("KNA", "Saint Kitts and Nevis"), ("LCA", "Saint Lucia"),
+        ("MAF", "Saint Martin"), ("VCT", "Saint Vincent and the Grenadines"), ("SXM", "Sint Maarten"),
+        ("TTO", "Trinidad and Tobago"), ("TCA", "Turks and Caicos Islands"), ("VIR", "US Virgin Islands"),
+    ],
+    ("North America", "Central America"): [
+        ("BLZ", "Belize"), ("CRI", "Costa Rica"), ("SLV", "El Salvador"), ("GTM", "Guatemala"),
+        ("HND", "Honduras"), ("MEX", "Mexico"), ("NIC", "Nicaragua"), ("PAN", "Panama"),
+    ],
+    ("North America", "Northern America"): [
+        ("BMU", "Bermuda"), ("CAN", "Canada"), ("GRL", "Greenland"), ("SPM", "Saint Pierre and Miquelon"),
+        ("USA", "United States"),
+    ],
+    ("South America", "South America"): [
+        ("ARG", "Argentina"), ("BOL", "Bolivia"), ("BVT", "Bouvet Island"), ("BRA", "Brazil"), ("CHL", "Chile"),
+        ("COL", "Colombia"), ("ECU", "Ecuador"), ("FLK", "Falkland Islands"), ("GUF", "French Guiana"),
+        ("GUY", "Guyana"), ("PRY", "Paraguay"), ("PER", "Peru"),
+        ("SGS", "South Georgia and the South Sandwich Islands"), ("SUR", "Suriname"), ("URY", "Uruguay"),
+        ("VEN", "Venezuela"),
+    ],
+    ("Asia", "Central Asia"): [
+        ("KAZ", "Kazakhstan"), ("KGZ", "Kyrgyzstan"), ("TJK", "Tajikistan"), ("TKM", "Turkmenistan"),
+        ("UZB", "Uzbekistan"),
+    ],
+    ("Asia", "Eastern Asia"): [
+        ("CHN", "China"), ("HKG", "Hong Kong"), ("MAC", "Macao"), ("PRK", "North Korea"), ("JPN", "Japan"),
+        ("MNG", "Mongolia"), ("KOR", "South Korea"), ("TWN", "Taiwan"),
+    ],
+    ("Asia", "South-eastern Asia"): [
+        ("BRN", "Brunei"), ("KHM", "Cambodia"), ("IDN", "Indonesia"), ("LAO", "Laos"), ("MYS", "Malaysia"),
+        ("MMR", "Myanmar"), ("PHL", "Philippines"), ("SGP", "Singapore"), ("THA", "Thailand"),
+        ("TLS", "Timor-Leste"), ("VNM", "Vietnam"),
+    ],
+    ("Asia", "Southern Asia"): [
+        ("AFG", "Afghanistan"), ("BGD", "Bangladesh"), ("BTN", "Bhutan"), ("IND", "India"), ("IRN", "Iran"),
+        ("MDV", "Maldives"), ("NPL", "Nepal"), ("PAK", "Pakistan"), ("LKA", "Sri Lanka"),
+    ],
+    ("Asia", "Western Asia"): [
+        ("ARM", "Armenia"), ("AZE", "Azerbaijan"), ("BHR", "Bahrain"), ("CYP", "Cyprus"), ("GEO", "Georgia"),
+        ("IRQ", "Iraq"), ("ISR", "Israel"), ("JOR", "Jordan"), ("KWT", "Kuwait"), ("LBN", "Lebanon"),
+        ("OMN", "Oman"), ("QAT", "Qatar"), ("SAU", "Saudi Arabia"), ("PSE", "Palestine"), ("SYR", "Syria"),
+        ("TUR", "Türkiye"), ("ARE", "United Arab Emirates"), ("YEM", "Yemen"),
+    ],
+    ("Europe", "Eastern Europe"): [
+        ("BLR", "Belarus"), ("BGR", "Bulgaria"), ("CZE", "Czechia"), ("HUN", "Hungary"), ("POL", "Poland"),
+        ("MDA", "Moldova"), ("ROU", "Romania"), ("RUS", "Russia"), ("SVK", "Slovakia"), ("UKR", "Ukraine"),
+    ],
+    ("Europe", "Northern Europe"): [
+        ("ALA", "Åland Islands"), ("DNK", "Denmark"), ("EST", "Estonia"), ("FRO", "Faroe Islands"),
+        ("FIN", "Finland"), ("GGY", "Guernsey"), ("ISL", "Iceland"), ("IRL", "Ireland"), ("IMN", "Isle of Man"),
+        ("JEY", "Jersey"), ("LVA", "Latvia"), ("LTU", "Lithuania"), ("NOR", "Norway"),
+        ("SJM", "Svalbard and Jan Mayen"), ("SWE", "Sweden"), ("GBR", "United Kingdom"),
+    ],
+    ("Europe", "Southern Europe"): [
+        ("ALB", "Albania"), ("AND", "Andorra"), ("BIH", "Bosnia and Herzegovina"), ("HRV", "Croatia"),
+        ("GIB", "Gibraltar"), ("GRC", "Greece"), ("VAT", "Holy See"), ("ITA", "Italy"), ("MLT", "Malta"),
+        ("MNE", "Montenegro"), ("MKD", "North Macedonia"), ("PRT", "Portugal"), ("SMR", "San Marino"),
+        ("SRB", "Serbia"), ("SVN", "Slovenia"), ("ESP", "Spain"),
+    ],
+    ("Europe", "Western Europe"): [
+        ("AUT", "Austria"), ("BEL", "Belgium"), ("FRA", "France"), ("DEU", "Germany"), ("LIE", "Liechtenstein"),
+        ("LUX", "Luxembourg"), ("MCO", "Monaco"), ("NLD", "Netherlands"), ("CHE", "Switzerland"),
+    ],
+    ("Oceania", "Australia and New Zealand"): [
+        ("AUS", "Australia"), ("CXR", "Christmas Island"), ("CCK", "Cocos (Keeling) Islands"),
+        ("HMD", "Heard Island and McDonald Islands"), ("NZL", "New Zealand"), ("NFK", "Norfolk Island"),
+    ],
+    ("Oceania", "Melanesia"): [
+        ("FJI", "Fiji"), ("NCL", "New Caledonia"), ("PNG", "Papua New Guinea"), ("SLB", "Solomon Islands"),
+        ("VUT", "Vanuatu"),
+    ],
+    ("Oceania", "Micronesia"): [
+        ("GUM", "Guam"), ("KIR", "Kiribati"), ("MHL", "Marshall Islands"), ("FSM", "Micronesia"),
+        ("NRU", "Nauru"), ("MNP", "Northern Mariana Islands"), ("PLW", "Palau"),
+        ("UMI", "US Minor Outlying Islands"),
+    ],
+    ("Oceania", "Polynesia"): [
+        ("ASM", "American Samoa"), ("COK", "Cook Islands"), ("PYF", "French Polynesia"), ("NIU", "Niue"),
+        ("PCN", "Pitcairn"), ("WSM", "Samoa"), ("TKL", "Tokelau"), ("TON", "Tonga"), ("TUV", "Tuvalu"),
+        ("WLF", "Wallis and Futuna"),
+    ],
+    ("Antarctica", "Antarctica"): [
+        ("ATA", "Antarctica"),
+    ],
+}
+
+# Total country area in km², the weights for area-weighted means (one for every row of the table)
+COUNTRY_AREA_KM2 = {
+    # Africa
+    "DZA": 2381741, "EGY": 1002450, "LBY": 1759540, "MAR": 446550, "SDN": 1886068, "TUN": 163610,
+    "ESH": 266000, "IOT": 60, "BDI": 27834, "COM": 2235, "DJI": 23200, "ERI": 117600, "ETH": 1104300,
+    "ATF": 7747, "KEN": 580367, "MDG": 587041, "MWI": 118484, "MUS": 2040, "MYT": 374, "MOZ": 801590,
+    "REU": 2511, "RWA": 26338, "SYC": 455, "SOM": 637657, "SSD": 619745, "UGA": 241550, "TZA": 945087,
+    "ZMB": 752612, "ZWE": 390757, "AGO": 1246700, "CMR": 475442, "CAF": 622984, "TCD": 1284000, "COG": 342000,
+    "COD": 2344858, "GNQ": 28051, "GAB": 267668, "STP": 964, "BWA": 581730, "SWZ": 17364, "LSO": 30355,
+    "NAM": 825615, "ZAF": 1221037, "BEN": 114763, "BFA": 274222, "CPV": 4033, "CIV": 322463, "GMB": 11295,
+    "GHA": 238533, "GIN": 245857, "GNB": 36125, "LBR": 111369, "MLI": 1240192, "MRT": 1030700, "NER": 1267000,
+    "NGA": 923768, "SHN": 394, "SEN": 196722, "SLE": 71740, "TGO": 56785,
+    # North America
+    "AIA": 91, "ATG": 442, "ABW": 180, "BHS": 13943, "BRB": 430, "BES": 322, "VGB": 151, "CYM": 264,
+    "CUB": 109884, "CUW": 444, "DMA": 751, "DOM": 48671, "GRD": 344, "GLP": 1628, "HTI": 27750, "JAM": 10991,
+    "MTQ": 1128, "MSR": 102, "PRI": 9104, "BLM": 21, "KNA": 261, "LCA": 616, "MAF": 53, "VCT": 389, "SXM": 34,
+    "TTO": 5128, "TCA": 948, "VIR": 347, "BLZ": 22966, "CRI": 51100, "SLV": 21041, "GTM": 108889,
+    "HND": 112492, "MEX": 1964375, "NIC": 130373, "PAN": 75417, "BMU": 54, "CAN": 9984670, "GRL": 2166086,
+    "SPM": 242, "USA": 9833520,
+    # South America
+    "ARG": 2780400, "BOL": 1098581, "BVT": 49, "BRA": 8515767, "CHL": 756102, "COL": 1141748, "ECU": 283561,
+    "FLK": 12173, "GUF": 83534, "GUY": 214969, "PRY": 406752, "PER": 1285216, "SGS": 3903, "SUR": 163820,
+    "URY": 176215, "VEN": 916445,
+    # Asia
+    "KAZ": 2724900, "KGZ": 199951, "TJK": 143100, "TKM": 488100, "UZB": 448978, "CHN": 9596961, "HKG": 1106,
+    "MAC": 33, "PRK": 120538, "JPN": 377975, "MNG": 1564116, "KOR": 100210, "TWN": 36193, "BRN": 5765,
+    "KHM": 181035, "IDN": 1904569, "LAO": 236800, "MYS": 330803, "MMR": 676578, "PHL": 300000, "SGP": 728,
+    "THA": 513120, "TLS": 14874, "VNM": 331212, "AFG": 652230, "BGD": 148460, "BTN": 38394, "IND": 3287263,
+    "IRN": 1648195, "MDV": 298, "NPL": 147181, "PAK": 881913, "LKA": 65610, "ARM": 29743, "AZE": 86600,
+    "BHR": 780, "CYP": 9251, "GEO": 69700, "IRQ": 438317, "ISR": 22072, "JOR": 89342, "KWT": 17818,
+    "LBN": 10452, "OMN": 309500, "QAT": 11586, "SAU": 2149690, "PSE": 6020, "SYR": 185180, "TUR": 783562,
+    "ARE": 83600, "YEM": 527968,
+    # Europe
+    "BLR": 207600, "BGR": 110879, "CZE": 78867, "HUN": 93028, "POL": 312696, "MDA": 33846, "ROU": 238397,
+    "RUS": 17098246, "SVK": 49035, "UKR": 603550, "ALA": 1580, "DNK": 42933, "EST": 45228, "FRO": 1399,
+    "FIN": 338424, "GGY": 78, "ISL": 103000, "IRL": 70273, "IMN": 572, "JEY": 116, "LVA": 64589, "LTU": 65300,
+    "NOR": 323802, "SJM": 61399, "SWE": 450295, "GBR": 242495, "ALB": 28748, "AND": 468, "BIH": 51209,
+    "HRV": 56594, "GIB": 6.8, "GRC": 131957, "VAT": 0.49, "ITA": 301340, "MLT": 316, "MNE": 13812,
+    "MKD": 25713, "PRT": 92212, "SMR": 61, "SRB": 88361, "SVN": 20273, "ESP": 505990, "AUT": 83871,
+    "BEL": 30528, "FRA": 551695, "DEU": 357588, "LIE": 160, "LUX": 2586, "MCO": 2.02, "NLD": 41850,
+    "CHE": 41285,
+    # Oceania
+    "AUS": 7692024, "CXR": 135, "CCK": 14, "HMD": 412, "NZL": 268838, "NFK": 36, "FJI": 18274, "NCL": 18575,
+    "PNG": 462840, "SLB": 28896, "VUT": 12189, "GUM": 549, "KIR": 811, "MHL": 181, "FSM": 702, "NRU": 21,
+    "MNP": 464, "PLW": 459, "UMI": 34, "ASM": 199, "COK": 236, "PYF": 4167, "NIU": 260, "PCN": 47,
+    "WSM": 2842, "TKL": 12, "TON": 747, "TUV": 26, "WLF": 142,
+    # Antarctica
+    "ATA": 14200000,
+}
+
+
+def _build_table():
+    rows = [
+        (code, name, continent, subregion)
+        for (continent, subregion), countries in _COUNTRIES_BY_SUBREGION.items()
+        for code, name in countries
+    ]
+    table = pd.DataFrame(rows, columns=["iso3", "name", "continent", "subregion"])
+    table = table.sort_values("iso3", ignore_index=True)
+    table["area_km2"] = table["iso3"].map(COUNTRY_AREA_KM2).astype("float64")
+    for column in ("continent", "subregion"):
+        table[column] = table[column].astype("category")
+    return table
+
+
+# The dimension table; the row number is the country id
+COUNTRIES = _build_table()
+ISO3 = pd.Index(COUNTRIES["iso3"])
+
+
+def country_ids(codes):
+    """Return the country id of every ISO-3 code in ``codes`` (-1 for unknown codes).
+
+    For a categorical column only its categories are looked up; the rows are
+    then resolved with one integer take.
+    """
+    if isinstance(getattr(codes, "dtype", None), pd.CategoricalDtype):
+        values = codes.array if isinstance(codes, pd.Series) else codes
+        category_ids = np.append(ISO3.get_indexer(values.categories), -1)
+        # Missing values have code -1, which picks the trailing -1
+        return category_ids[values.codes]
+    return ISO3.get_indexer(pd.Index(codes))
+
+
+def lookup(ids, column):
+    """Return the numeric ``column`` of the dimension table for ``ids``, NaN where the id is -1."""
+    values = COUNTRIES[column].to_numpy(dtype="float64")
+    return np.where(ids >= 0, values[ids], np.nan)
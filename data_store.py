@@ -0,0 +1,227 @@
+"""Columnar, file-backed data store for the slash-and-burn prevalence map.
+
+Prevalence data lives in ``data/prevalence/`` as Arrow IPC (``.arrow``) or
+Parquet (``.parquet``) files. Every file is treated as one partition. Arrow IPC
+files are memory-mapped so the column buffers are shared with the page cache
+instead of being copied into the Python process.
+
+Prevalence history is kept in long format (one row per country and year) in
+``data/timeseries/``. Fire detections are stored pre-aggregated in ``data/detections/`` by
+``ingest.py``; the app never reads the raw points.
+
+Run ``python data_store.py`` to write the built-in sample data as a partition.
+"""
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.ipc as ipc
+import pyarrow.parquet as pq
+import streamlit as st
+
+# Data directory - can be overridden to point the app at another dataset
+DATA_DIR = Path(os.environ.get("SLASH_BURN_DATA_DIR", Path(__file__).parent / "data"))
+PREVALENCE_DIR = DATA_DIR / "prevalence"
+DETECTIONS_DIR = DATA_DIR / "detections"
+TIMESERIES_DIR = DATA_DIR / "timeseries"
+COLUMNAR_SUFFIXES = (".arrow", ".parquet")
+# Low-cardinality string columns, loaded as categoricals: one code per row instead of one string
+CATEGORICAL_COLUMNS = ("country_code", "country_name")
+
+# Sample data - used when no prevalence files have been written yet
+# Format: country code, country name, prevalence score (0-100)
+SAMPLE_DATA = {
+    "country_code": [
+        "USA", "CAN", "MEX", "BRA", "ARG", "COL", "PER", "BOL",
+        "VEN", "CHL", "ECU", "GBR", "FRA", "DEU", "ITA", "ESP",
+        "PRT", "RUS", "CHN", "IND", "IDN", "MYS", "THA", "VNM",
+        "PHL", "AUS", "NZL", "ZAF", "NGA", "EGY", "COD", "ETH",
+        "KEN", "TZA", "UGA", "GHA", "CMR", "CIV", "MDG", "MOZ"
+    ],
+    "country_name": [
+        "United States", "Canada", "Mexico", "Brazil", "Argentina", "Colombia", "Peru", "Bolivia",
+        "Venezuela", "Chile", "Ecuador", "United Kingdom", "France", "Germany", "Italy", "Spain",
+        "Portugal", "Russia", "China", "India", "Indonesia", "Malaysia", "Thailand", "Vietnam",
+        "Philippines", "Australia", "New Zealand", "South Africa", "Nigeria", "Egypt", "DR Congo", "Ethiopia",
+        "Kenya", "Tanzania", "Uganda", "Ghana", "Cameroon", "Côte d'Ivoire", "Madagascar", "Mozambique"
+    ],
+    "slash_burn_prevalence": [
+        5, 8, 20, 85, 15, 60, 55, 40,
+        50, 10, 30, 2, 3, 2, 4, 5,
+        7, 15, 25, 30, 90, 80, 65, 70,
+        60, 10, 5, 40, 75, 10, 95, 80,
+        70, 65, 60, 70, 75, 65, 85, 70
+    ]
+}
+
+
+def partition_signatures(directory=PREVALENCE_DIR):
+    """Return ``(path, mtime_ns, size)`` for every columnar file in ``directory``.
+
+    The signature changes whenever a file is rewritten, which is what the
+    caches below are keyed on.
+    """
+    directory = Path(directory)
+    if not directory.is_dir():
+        return ()
+    signatures = []
+    for path in sorted(directory.iterdir()):
+        if path.suffix in COLUMNAR_SUFFIXES and path.is_file():
+            stat = path.stat()
+            signatures.append((str(path), stat.st_mtime_ns, stat.st_size))
+    return tuple(signatures)
+
+
+@st.cache_resource(show_spinner=False)
+def _published():
+    # Holds the snapshot as {directory: signatures}; replaced whole, never mutated
+    return {"snapshot": None}
+
+
+def publish(snapshot):
+    """Make ``snapshot`` (``{directory: signatures}``) the data every session reads.
+
+    The background watcher builds a snapshot's caches first and only then
+    publishes it, in one assignment, so sessions switch over atomically.
+    """
+    _published()["snapshot"] = {str(directory): signatures for directory, signatures in snapshot.items()}
+
+
+def published_snapshot():
+    """Return the published ``{directory: signatures}``, or ``None`` before the first publish."""
+    return _published()["snapshot"]
+
+
+def current_signatures(directory=PREVALENCE_DIR):
+    """Return the published signatures for ``directory``, scanning it if none were published."""
+    snapshot = published_snapshot()
+    if snapshot is not None and str(directory) in snapshot:
+        return snapshot[str(directory)]
+    return partition_signatures(directory)
+
+
+def read_table(path):
+    """Read one partition file into an Arrow table, memory-mapped where possible."""
+    path = Path(path)
+    if path.suffix == ".arrow":
+        # Uncompressed IPC files are read zero-copy straight out of the mapping
+        return ipc.open_file(pa.memory_map(str(path), "r")).read_all()
+    return pq.read_table(path, memory_map=True)
+
+
+@st.cache_resource(max_entries=64, show_spinner=False)
+def _read_partition(path, mtime_ns, size):
+    # mtime_ns and size are only part of the cache key
+    return read_table(path)
+
+
+def _decode_dictionaries(table):
+    # Compiled partitions store text dictionary encoded; other writers don't
+    fields = [
+        pa.field(field.name, field.type.value_type) if pa.types.is_dictionary(field.type) else field
+        for field in table.schema
+    ]
+    return table.cast(pa.schema(fields, metadata=table.schema.metadata))
+
+
+@st.cache_resource(max_entries=6, show_spinner=False)
+def _load_frame(signatures):
+    tables = [_read_partition(*signature) for signature in signatures]
+    if len({table.schema for table in tables}) > 1:
+        # Partitions from different writers differ in encoding and numeric types
+        # (e.g. int64 vs float64 prevalence): decode, then widen to common types
+        tables = [_decode_dictionaries(table) for table in tables]
+        table = pa.concat_tables(tables, promote_options="permissive")
+    else:
+        table = pa.concat_tables(tables) if len(tables) > 1 else tables[0]
+    # split_blocks avoids consolidating columns into new 2D blocks (an extra copy)
+    categories = [name for name in CATEGORICAL_COLUMNS if name in table.column_names]
+    frame = table.to_pandas(split_blocks=True, categories=categories)
+    # Lets derived caches (figures, exports) tell dataset versions apart
+    frame.attrs["version"] = signatures
+    # Row offsets of the partitions, so a filter result can name the partitions it comes from
+    frame.attrs["partition_offsets"] = tuple(np.cumsum([0, *(len(table) for table in tables)]).tolist())
+    return frame
+
+
+@st.cache_resource(show_spinner=False)
+def _sample_frame():
+    frame = pd.DataFrame(SAMPLE_DATA).astype({name: "category" for name in CATEGORICAL_COLUMNS})
+    frame.attrs["version"] = "sample"
+    return frame
+
+
+def load_data(signatures=None):
+    """Return the prevalence DataFrame.
+
+    Partitions are parsed once per file version: a refreshed or new file is
+    picked up without restarting the server (on the next rerun, or once the
+    watcher publishes it), while unchanged files are served from the shared
+    cache. The frame is shared between sessions, so callers must not modify it
+    in place. ``signatures`` selects a snapshot other than the current one.
+    """
+    if signatures is None:
+        signatures = current_signatures(PREVALENCE_DIR)
+    if not signatures:
+        return _sample_frame()
+    return _load_frame(signatures)
+
+
+def load_timeseries(signatures=None):
+    """Return the long-format prevalence history, or ``None`` if there is none.
+
+    Columns are ``country_code``, ``country_name``, ``year`` and
+    ``slash_burn_prevalence``; like ``load_data()`` the frame is shared.
+    """
+    if signatures is None:
+        signatures = current_signatures(TIMESERIES_DIR)
+    if not signatures:
+        return None
+    return _load_frame(signatures)
+
+
+@st.cache_resource(max_entries=8, show_spinner=False)
+def _load_grid_level(signatures, resolution):
+    grid = _load_frame(signatures)
+    level = grid[grid["resolution"] == resolution].reset_index(drop=True)
+    level["intensity"] = np.log10(level["detections"])
+    return level
+
+
+def has_detection_grid():
+    return bool(current_signatures(DETECTIONS_DIR))
+
+
+def load_detection_grid(resolution):
+    """Return the precomputed fire-detection counts at ``resolution``.
+
+    The table is written by ``ingest.py``; ``None`` is returned until it exists.
+    """
+    signatures = current_signatures(DETECTIONS_DIR)
+    if not signatures:
+        return None
+    return _load_grid_level(signatures, resolution)
+
+
+def write_partition(df, name, directory=PREVALENCE_DIR):
+    """Write ``df`` as an Arrow IPC partition called ``name``.
+
+    The file is written next to its destination and moved into place, so a
+    running app never reads a half-written partition.
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"{name}.arrow"
+    tmp_path = path.with_suffix(".arrow.tmp")
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    with pa.OSFile(str(tmp_path), "wb") as sink:
+        with ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(tmp_path, path)
+    return path
+
+
+if __name__ == "__main__":
+    print(f"Wrote {write_partition(pd.DataFrame(SAMPLE_DATA), 'sample')}")
@@ -0,0 +1,90 @@
+"""Chunked export of the Map page's filtered rows.
+
+Exports are produced from the shared frame and the filter's row positions, a
+chunk at a time, and only when the user actually clicks download. Finished
+files are kept in a shared cache (bounded by total bytes) per dataset version,
+filter state and format, so repeated downloads don't re-serialize anything.
+"""
+import io
+import os
+import zlib
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import streamlit as st
+
+from lru import LRUCache
+
+# Format label -> (file extension, MIME type)
+EXPORT_FORMATS = {
+    "CSV": ("csv", "text/csv"),
+    "CSV (gzip)": ("csv.gz", "application/gzip"),
+    "Parquet": ("parquet", "application/vnd.apache.parquet"),
+}
+CHUNK_ROWS = 100_000
+EXPORT_CACHE_BYTES = int(os.environ.get("SLASH_BURN_EXPORT_CACHE_MB", 256)) * 2**20
+
+
+def iter_chunks(df, positions, chunk_rows=CHUNK_ROWS):
+    """Yield the rows at ``positions`` as DataFrames of at most ``chunk_rows`` rows."""
+    # Always yield at least once so empty exports still get a header/schema
+    for start in range(0, max(len(positions), 1), chunk_rows):
+        yield df.iloc[positions[start:start + chunk_rows]]
+
+
+def iter_csv(df, positions, chunk_rows=CHUNK_ROWS):
+    header = True
+    for chunk in iter_chunks(df, positions, chunk_rows):
+        yield chunk.to_csv(index=False, header=header).encode("utf-8")
+        header = False
+
+
+def iter_gzip(blocks):
+    """Gzip-compress an iterable of byte blocks incrementally."""
+    # wbits=31 selects the gzip container rather than raw zlib
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    for block in blocks:
+        compressed = compressor.compress(block)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def write_parquet(df, positions, sink, chunk_rows=CHUNK_ROWS):
+    """Write the rows at ``positions`` to ``sink``, one row group per chunk."""
+    writer = None
+    for chunk in iter_chunks(df, positions, chunk_rows):
+        table = pa.Table.from_pandas(chunk, preserve_index=False)
+        if writer is None:
+            writer = pq.ParquetWriter(sink, table.schema, compression="zstd")
+        writer.write_table(table)
+    writer.close()
+
+
+def export_bytes(df, positions, export_format):
+    """Serialize the rows at ``positions`` in ``export_format`` (a key of EXPORT_FORMATS)."""
+    buffer = io.BytesIO()
+    if export_format == "Parquet":
+        write_parquet(df, positions, buffer)
+    else:
+        blocks = iter_csv(df, positions)
+        if export_format == "CSV (gzip)":
+            blocks = iter_gzip(blocks)
+        for block in blocks:
+            buffer.write(block)
+    return buffer.getvalue()
+
+
+@st.cache_resource(show_spinner=False)
+def export_cache():
+    """Return the process-wide export cache (shared by all sessions)."""
+    return LRUCache(EXPORT_CACHE_BYTES, sizeof=len)
+
+
+def cached_export(rows, filter_key, export_format):
+    """Return the export of ``rows`` (``FilteredRows``) for a filter state, serializing it at most once.
+
+    ``filter_key`` identifies the filter state that produced the rows.
+    """
+    key = (rows.attrs.get("version"), filter_key, export_format)
+    return export_cache().get_or_build(key, lambda: export_bytes(rows.df, rows.positions, export_format))
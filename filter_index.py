@@ -0,0 +1,119 @@
+"""Precomputed index for the Map page's region and prevalence filters.
+
+The index is built once per dataset version and shared between sessions.
+Prevalence values are kept sorted, both for the whole table and for every
+region (found by joining the rows' ISO codes to the country dimension table),
+so a region and threshold range is two binary searches and filtering never
+scans or copies the whole table. The prevalence history is indexed the same
+way, once for all years: rows are sorted by year first, so a year is two more
+binary searches rather than a snapshot copy with its own index. Results are
+``FilteredRows``: the shared frame plus the matching row positions,
+materialized as a DataFrame only where one is needed.
+"""
+import numpy as np
+import streamlit as st
+
+from regions import REGION_ORDER, region_numbers
+
+
+class FilteredRows:
+    """The rows of a shared frame at ``positions`` (sorted, unique), without copying them.
+
+    The ``version`` in ``attrs`` names only the partitions the rows come from
+    (and the ``year`` of a history frame), so derived caches (figures, exports)
+    stay valid when other partitions change.
+    """
+
+    def __init__(self, df, positions=None, year=None):
+        self.df = df
+        self.positions = np.arange(len(df)) if positions is None else positions
+        self.year = year
+
+    def __len__(self):
+        return len(self.positions)
+
+    @property
+    def attrs(self):
+        version = self.df.attrs.get("version")
+        offsets = self.df.attrs.get("partition_offsets")
+        if offsets is not None:
+            bounds = np.searchsorted(self.positions, offsets)
+            version = tuple(signature for signature, start, stop in zip(version, bounds, bounds[1:]) if stop > start)
+        if self.year is not None:
+            version = (version, self.year)
+        return {**self.df.attrs, "version": version}
+
+    def frame(self):
+        """Return the rows as a DataFrame; only a strict subset is copied."""
+        if len(self.positions) == len(self.df):
+            return self.df
+        return self.df.iloc[self.positions]
+
+
+class FilterIndex:
+    """Value-sorted row positions of ``df``, per region and, for a history, per year."""
+
+    def __init__(self, df, value_column="slash_burn_prevalence", code_column="country_code", year_column="year"):
+        self.df = df
+        values = df[value_column].to_numpy()
+        years = df[year_column].to_numpy() if year_column in df.columns else np.zeros(len(df), dtype=np.int8)
+        # Half-size positions, since sessions hold on to their filter results
+        dtype = np.int32 if len(df) < 2**31 else np.int64
+        # Shared result for filters that keep every row (the default view)
+        self.all_rows = np.arange(len(df), dtype=dtype)
+        later = years[1:] > years[:-1]
+        if np.all(later | ((years[1:] == years[:-1]) & (values[1:] >= values[:-1]))):
+            # Compiled partitions are stored in (year, value) order (see compile_data.py), so no sort is needed
+            order = self.all_rows
+        else:
+            order = np.lexsort((values, years)).astype(dtype)
+        # An integer join: categorical codes are resolved per category, not per row
+        numbers = region_numbers(df[code_column])[order]
+        # region -> (row positions, their years, their values), in (year, value) order
+        self.regions = {"All": (order, years[order], values[order])}
+        for number, name in enumerate(REGION_ORDER, start=1):
+            self.regions[name] = tuple(column[numbers == number] for column in self.regions["All"])
+
+    def range_positions(self, low, high, region="All", year=None):
+        """Return the positions of rows in ``region`` with ``low <= value <= high``, in value order.
+
+        ``year`` selects one year of a history. Cost is O(log n) plus the k
+        matching positions, which are a view.
+        """
+        order, years, values = self.regions[region]
+        first, last = 0, len(order)
+        if year is not None:
+            first, last = np.searchsorted(years, year, side="left"), np.searchsorted(years, year, side="right")
+        start = first + np.searchsorted(values[first:last], low, side="left")
+        stop = first + np.searchsorted(values[first:last], high, side="right")
+        return order[start:stop]
+
+    def table_order(self, positions):
+        """Return value-ordered ``positions`` in table order."""
+        if len(positions) == len(self.all_rows):
+            return self.all_rows
+        return np.sort(positions)
+
+    def positions(self, region, low, high, year=None):
+        """Return the row positions matching the filters, in table order.
+
+        Cost is O(log n + k log k) for k matching rows (the binary searches,
+        then sorting the results); ``region`` is one of ``REGION_ORDER`` or ``"All"``.
+        """
+        return self.table_order(self.range_positions(low, high, region, year))
+
+    def rows(self, region, low, high, year=None):
+        """Return the rows matching the filters as ``FilteredRows``."""
+        return FilteredRows(self.df, self.positions(region, low, high, year), year)
+
+
+# Current data and history, for the published snapshot and the one before it
+@st.cache_resource(max_entries=4, show_spinner=False)
+def _build_filter_index(frame_id, _df):
+    # The cached index keeps the frame alive, so its id can't be reused while cached
+    return FilterIndex(_df)
+
+
+def load_filter_index(df):
+    """Return the shared index for ``df`` (a frame returned by ``load_data()`` or ``load_timeseries()``)."""
+    return _build_filter_index(id(df), df)
@@ -0,0 +1,320 @@
+"""Multi-resolution boundary geometry for sub-national choropleths.
+
+Full-resolution admin boundaries are far too large to send with every map, so
+this pipeline precomputes simplified versions at several detail levels:
+
+1. Coordinates are quantized to an integer grid with the same step on both
+   axes, so shared vertices match and grid distances are distances in degrees.
+2. Rings are cut into arcs at junctions (points where neighbouring polygons
+   meet), and every shared border is stored once (TopoJSON style).
+3. Each arc gets a Douglas-Peucker importance per vertex. Because a shared
+   border is one arc, neighbours are simplified identically and the result
+   has no gaps or overlaps.
+4. Every level keeps the vertices above its tolerance and is written as a
+   compact, delta-encoded TopoJSON file.
+
+The Map page decodes only the level that suits the selected region, sends
+only the features inside the region and zooms the map to it.
+
+Usage:
+    python geometry.py admin1.geojson --id-property shapeISO
+"""
+import argparse
+import json
+from pathlib import Path
+
+import numpy as np
+import streamlit as st
+
+from data_store import DATA_DIR
+
+GEOMETRY_DIR = DATA_DIR / "geometry"
+OBJECT_NAME = "admin"
+QUANTIZATION = 1_000_000
+# Simplification tolerance in degrees, from coarsest to finest
+LEVEL_TOLERANCES = [0.2, 0.05, 0.01]
+# Rough width of the map in pixels, used to turn a viewport into degrees per pixel
+MAP_PIXELS = 900
+# Column holding the feature id for sub-national rows
+ADMIN_CODE_COLUMN = "admin_code"
+
+
+def polygons_of(geometry):
+    if geometry["type"] == "Polygon":
+        return [geometry["coordinates"]]
+    if geometry["type"] == "MultiPolygon":
+        return geometry["coordinates"]
+    return []
+
+
+def quantize_features(features, quantization=QUANTIZATION):
+    """Return ``(transform, polygons)`` with rings as closed lists of integer points."""
+    coords = np.array([
+        point
+        for feature in features
+        for polygon in polygons_of(feature["geometry"])
+        for ring in polygon
+        for point in ring
+    ], dtype="float64")[:, :2]
+    x0, y0 = coords.min(axis=0)
+    x1, y1 = coords.max(axis=0)
+    # One step for both axes, so grid distances (and Douglas-Peucker importance) are isotropic
+    kx = ky = max(x1 - x0, y1 - y0) / (quantization - 1) or 1.0
+
+    quantized = []
+    for feature in features:
+        feature_polygons = []
+        for polygon in polygons_of(feature["geometry"]):
+            rings = []
+            for ring in polygon:
+                points = []
+                for x, y, *_ in ring:
+                    point = (round((x - x0) / kx), round((y - y0) / ky))
+                    if not points or points[-1] != point:
+                        points.append(point)
+                if points[0] != points[-1]:
+                    points.append(points[0])
+                # Rings that collapse under quantization are dropped
+                if len(points) >= 4:
+                    rings.append(points)
+            if rings:
+                feature_polygons.append(rings)
+        quantized.append(feature_polygons)
+    return {"scale": [kx, ky], "translate": [x0, y0]}, quantized
+
+
+def find_junctions(rings):
+    """Return the points where rings meet with different neighbours."""
+    neighbours = {}
+    junctions = set()
+    for ring in rings:
+        points = ring[:-1]
+        for i, point in enumerate(points):
+            pair = frozenset((points[i - 1], points[(i + 1) % len(points)]))
+            seen = neighbours.setdefault(point, pair)
+            if seen != pair:
+                junctions.add(point)
+    return junctions
+
+
+def cut_ring(ring, junctions):
+    """Split a closed ring into arcs that start and end at junctions."""
+    points = ring[:-1]
+    cuts = [i for i, point in enumerate(points) if point in junctions]
+    if not cuts:
+        # A ring without junctions is one closed arc; start it at a canonical
+        # point so the same ring from two features is recognised as shared
+        start = points.index(min(points))
+        rotated = points[start:] + points[:start]
+        return [rotated + [rotated[0]]]
+    rotated = points[cuts[0]:] + points[:cuts[0]]
+    offsets = [i - cuts[0] for i in cuts] + [len(points)]
+    rotated.append(rotated[0])
+    return [rotated[start:stop + 1] for start, stop in zip(offsets, offsets[1:])]
+
+
+def arc_importance(arc):
+    """Douglas-Peucker importance of every vertex (endpoints are always kept)."""
+    points = np.asarray(arc, dtype="float64")
+    importance = np.zeros(len(points))
+    importance[0] = importance[-1] = np.inf
+    stack = [(0, len(points) - 1, np.inf)]
+    while stack:
+        start, stop, cap = stack.pop()
+        if stop - start < 2:
+            continue
+        a, b = points[start], points[stop]
+        inner = points[start + 1:stop]
+        dx, dy = b - a
+        length = np.hypot(dx, dy)
+        if length == 0:
+            distances = np.hypot(*(inner - a).T)
+        else:
+            distances = np.abs(dx * (inner[:, 1] - a[1]) - dy * (inner[:, 0] - a[0])) / length
+        k = int(distances.argmax())
+        # Capping by the parent keeps importance monotonic down the split tree
+        value = min(distances[k], cap)
+        importance[start + 1 + k] = value
+        stack.append((start, start + 1 + k, value))
+        stack.append((start + 1 + k, stop, value))
+    if arc[0] == arc[-1] and len(arc) > 3:
+        # Closed arcs are whole rings: keep enough vertices to stay a polygon
+        importance[np.argsort(importance[1:-1])[-2:] + 1] = np.inf
+    return importance
+
+
+def build_topology(features, id_property, quantization=QUANTIZATION):
+    """Return the shared-arc topology with per-vertex importance, ready to write."""
+    transform, polygons = quantize_features(features, quantization)
+    junctions = find_junctions([ring for feature in polygons for polygon in feature for ring in polygon])
+
+    arcs, arc_ids = [], {}
+
+    def arc_id(arc):
+        key = tuple(arc)
+        if key in arc_ids:
+            return arc_ids[key]
+        if key[::-1] in arc_ids:
+            return ~arc_ids[key[::-1]]
+        arc_ids[key] = len(arcs)
+        arcs.append(arc)
+        return arc_ids[key]
+
+    geometries = []
+    for feature, feature_polygons in zip(features, polygons):
+        if not feature_polygons:
+            continue
+        arc_polygons = [
+            [[arc_id(arc) for arc in cut_ring(ring, junctions)] for ring in polygon]
+            for polygon in feature_polygons
+        ]
+        geometries.append({
+            "type": "MultiPolygon",
+            "id": str(feature["properties"][id_property]),
+            "arcs": arc_polygons,
+        })
+    return {
+        "transform": transform,
+        "geometries": geometries,
+        "arcs": [np.asarray(arc, dtype="int64") for arc in arcs],
+        "importance": [arc_importance(arc) for arc in arcs],
+    }
+
+
+def topology_level(topology, tolerance):
+    """Return a TopoJSON document keeping vertices more important than ``tolerance`` degrees."""
+    # Both axes share one scale (see quantize_features), so this holds in any direction
+    tolerance_q = tolerance / topology["transform"]["scale"][0]
+    arcs = []
+    for arc, importance in zip(topology["arcs"], topology["importance"]):
+        kept = arc[importance >= tolerance_q]
+        # Delta encoding keeps the integers (and the JSON) short
+        arcs.append(np.concatenate([kept[:1], np.diff(kept, axis=0)]).tolist())
+    return {
+        "type": "Topology",
+        "transform": topology["transform"],
+        "objects": {OBJECT_NAME: {"type": "GeometryCollection", "geometries": topology["geometries"]}},
+        "arcs": arcs,
+    }
+
+
+def level_path(level, directory=GEOMETRY_DIR):
+    return Path(directory) / f"{OBJECT_NAME}.L{level}.topo.json"
+
+
+def write_levels(features, id_property, directory=GEOMETRY_DIR, tolerances=LEVEL_TOLERANCES):
+    """Precompute and write every detail level; returns the written paths."""
+    topology = build_topology(features, id_property)
+    Path(directory).mkdir(parents=True, exist_ok=True)
+    paths = []
+    for level, tolerance in enumerate(tolerances):
+        path = level_path(level, directory)
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(topology_level(topology, tolerance), separators=(",", ":")))
+        tmp_path.replace(path)
+        paths.append(path)
+    return paths
+
+
+def topology_to_geojson(topo):
+    """Decode a TopoJSON document from ``topology_level`` into a GeoJSON FeatureCollection."""
+    (kx, ky), (x0, y0) = topo["transform"]["scale"], topo["transform"]["translate"]
+    decoded = []
+    for arc in topo["arcs"]:
+        points = np.cumsum(np.asarray(arc, dtype="float64").reshape(-1, 2), axis=0)
+        decoded.append(np.round(points * (kx, ky) + (x0, y0), 5).tolist())
+
+    def ring_coordinates(arc_ids):
+        ring = []
+        for arc_id in arc_ids:
+            points = decoded[arc_id] if arc_id >= 0 else decoded[~arc_id][::-1]
+            ring.extend(points if not ring else points[1:])
+        return ring
+
+    features = []
+    for geometry in topo["objects"][OBJECT_NAME]["geometries"]:
+        polygons = []
+        for polygon in geometry["arcs"]:
+            rings = [ring_coordinates(ring) for ring in polygon]
+            # Rings simplified down to a line are dropped
+            rings = [ring for ring in rings if len(ring) >= 4]
+            if rings:
+                polygons.append(rings)
+        feature = {
+            "type": "Feature",
+            "id": geometry["id"],
+            "properties": {},
+            "geometry": {"type": "MultiPolygon", "coordinates": polygons},
+        }
+        if polygons:
+            points = np.array([point for polygon in polygons for ring in polygon for point in ring])
+            feature["bbox"] = [*points.min(axis=0).tolist(), *points.max(axis=0).tolist()]
+        features.append(feature)
+    return {"type": "FeatureCollection", "features": features}
+
+
+def clip_to_viewport(geojson, viewport):
+    """Return the features of ``geojson`` whose bounding box overlaps ``viewport``.
+
+    The result's ``bbox`` is the viewport, which the map is zoomed to.
+    """
+    lat0, lat1, lon0, lon1 = viewport
+    features = [
+        feature for feature in geojson["features"]
+        if "bbox" in feature
+        and feature["bbox"][0] <= lon1 and feature["bbox"][2] >= lon0
+        and feature["bbox"][1] <= lat1 and feature["bbox"][3] >= lat0
+    ]
+    return {"type": "FeatureCollection", "bbox": [lon0, lat0, lon1, lat1], "features": features}
+
+
+def available_levels(directory=GEOMETRY_DIR):
+    return [level for level in range(len(LEVEL_TOLERANCES)) if level_path(level, directory).exists()]
+
+
+def choose_level(viewport, levels):
+    """Pick the coarsest level whose tolerance is below one pixel of ``viewport``."""
+    lat0, lat1, lon0, lon1 = viewport
+    degrees_per_pixel = (lon1 - lon0) / MAP_PIXELS
+    suitable = [level for level in levels if LEVEL_TOLERANCES[level] <= degrees_per_pixel]
+    return min(suitable) if suitable else max(levels)
+
+
+@st.cache_resource(max_entries=8, show_spinner=False)
+def _load_level(path, mtime_ns):
+    return topology_to_geojson(json.loads(Path(path).read_text()))
+
+
+@st.cache_resource(max_entries=16, show_spinner=False)
+def _load_viewport(path, mtime_ns, viewport):
+    return clip_to_viewport(_load_level(path, mtime_ns), viewport)
+
+
+def load_geometry(viewport):
+    """Return ``(key, geojson)`` for ``viewport``, or ``None`` without geometry.
+
+    The level suits the viewport's width, and only the features overlapping
+    the viewport are included; the map is zoomed to it. ``key`` identifies the
+    file version, level and viewport, for caching figures built on it.
+    """
+    levels = available_levels()
+    if not levels:
+        return None
+    path = level_path(choose_level(viewport, levels))
+    mtime_ns = path.stat().st_mtime_ns
+    viewport = tuple(viewport)
+    return (str(path), mtime_ns, viewport), _load_viewport(str(path), mtime_ns, viewport)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompute simplified boundary levels")
+    parser.add_argument("path", help="GeoJSON FeatureCollection of admin boundaries")
+    parser.add_argument("--id-property", required=True, help="feature property matching the data's admin_code")
+    args = parser.parse_args()
+    features = json.loads(Path(args.path).read_text())["features"]
+    for path in write_levels(features, args.id_property):
+        print(f"Wrote {path} ({path.stat().st_size:,} bytes)")
+
+
+if __name__ == "__main__":
+    main()
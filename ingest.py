@@ -0,0 +1,110 @@
+"""Streaming ingestion of point-level fire detections.
+
+Reads satellite fire-detection CSVs (e.g. NASA FIRMS exports) in fixed-size
+chunks and counts detections on a nested lat/lon grid. Only the finest level is
+accumulated while streaming; the coarser levels are rolled up from it, since
+every cell at resolution ``r`` splits into exactly four cells at ``r + 1``.
+Memory is bounded by the chunk size plus the number of occupied cells, never by
+the number of points.
+
+Usage:
+    python ingest.py fire_archive_*.csv
+"""
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from data_store import DETECTIONS_DIR, write_partition
+
+# Cell size at resolution 0 in degrees; each level halves it (4, 2, 1, 0.5, 0.25)
+BASE_CELL_DEGREES = 4.0
+RESOLUTIONS = range(5)
+FINEST = max(RESOLUTIONS)
+CHUNK_ROWS = 1_000_000
+
+
+def cell_degrees(resolution):
+    return BASE_CELL_DEGREES / 2 ** resolution
+
+
+def grid_shape(resolution):
+    """Return ``(rows, cols)`` of the global grid at ``resolution``."""
+    size = cell_degrees(resolution)
+    return int(180 / size), int(360 / size)
+
+
+def cell_ids(lat, lon, resolution=FINEST):
+    """Map lat/lon arrays to integer cell ids (``row * cols + col``)."""
+    size = cell_degrees(resolution)
+    rows, cols = grid_shape(resolution)
+    row = np.clip(((lat + 90.0) // size).astype(np.int64), 0, rows - 1)
+    col = np.clip(((lon + 180.0) // size).astype(np.int64), 0, cols - 1)
+    return row * cols + col
+
+
+def count_chunks(chunks, lat_column="latitude", lon_column="longitude"):
+    """Count detections per finest-level cell over an iterable of DataFrames."""
+    counts = pd.Series(dtype="int64")
+    for chunk in chunks:
+        lat = chunk[lat_column].to_numpy(dtype="float64")
+        lon = chunk[lon_column].to_numpy(dtype="float64")
+        valid = (np.abs(lat) <= 90) & (np.abs(lon) <= 180)
+        ids, n = np.unique(cell_ids(lat[valid], lon[valid]), return_counts=True)
+        counts = counts.add(pd.Series(n, index=ids), fill_value=0).astype("int64")
+    return counts
+
+
+def build_grid(counts):
+    """Roll finest-level counts up into one compact table covering every resolution."""
+    _, finest_cols = grid_shape(FINEST)
+    finest_row = counts.index.to_numpy() // finest_cols
+    finest_col = counts.index.to_numpy() % finest_cols
+    levels = []
+    for resolution in RESOLUTIONS:
+        shift = FINEST - resolution
+        size = cell_degrees(resolution)
+        level = (
+            pd.DataFrame({
+                "cell_row": (finest_row >> shift).astype("int32"),
+                "cell_col": (finest_col >> shift).astype("int32"),
+                "detections": counts.to_numpy(),
+            })
+            .groupby(["cell_row", "cell_col"], as_index=False, sort=True)["detections"]
+            .sum()
+        )
+        level.insert(0, "resolution", np.int8(resolution))
+        level["lat"] = ((level["cell_row"] + 0.5) * size - 90).astype("float32")
+        level["lon"] = ((level["cell_col"] + 0.5) * size - 180).astype("float32")
+        levels.append(level)
+    return pd.concat(levels, ignore_index=True)
+
+
+def ingest(paths, chunk_rows=CHUNK_ROWS, lat_column="latitude", lon_column="longitude"):
+    """Stream the CSV files at ``paths`` and write the precomputed grid table."""
+    def chunks():
+        for path in paths:
+            yield from pd.read_csv(
+                path,
+                usecols=[lat_column, lon_column],
+                dtype={lat_column: "float32", lon_column: "float32"},
+                chunksize=chunk_rows,
+            )
+
+    grid = build_grid(count_chunks(chunks(), lat_column, lon_column))
+    return write_partition(grid, "grid", DETECTIONS_DIR)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("paths", nargs="+", help="fire-detection CSV files")
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS)
+    parser.add_argument("--lat-column", default="latitude")
+    parser.add_argument("--lon-column", default="longitude")
+    args = parser.parse_args()
+    path = ingest(args.paths, args.chunk_rows, args.lat_column, args.lon_column)
+    print(f"Wrote {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Small thread-safe LRU cache shared between Streamlit sessions."""
+import threading
+from collections import OrderedDict
+
+
+class LRUCache:
+    """Size-bounded mapping that evicts the least recently used entry.
+
+    ``maxsize`` counts entries, or the total ``sizeof(value)`` of all entries
+    when ``sizeof`` is given (e.g. ``len`` for a byte budget). Streamlit serves
+    every session from its own thread, so all access goes through a lock.
+    ``hits`` and ``misses`` are kept for tuning ``maxsize``.
+    """
+
+    def __init__(self, maxsize, sizeof=None):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.total = 0
+        self._sizeof = sizeof or (lambda value: 1)
+        self._entries = OrderedDict()
+        self._sizes = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key in self._entries:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return self._entries[key]
+            self.misses += 1
+            return default
+
+    def put(self, key, value):
+        size = self._sizeof(value)
+        with self._lock:
+            self.total += size - self._sizes.get(key, 0)
+            self._entries[key] = value
+            self._sizes[key] = size
+            self._entries.move_to_end(key)
+            # An entry larger than the whole budget is evicted straight away
+            while self.total > self.maxsize:
+                oldest, _ = self._entries.popitem(last=False)
+                self.total -= self._sizes.pop(oldest)
+
+    def get_or_build(self, key, build):
+        """Return the entry for ``key``, calling ``build()`` to create it on a miss.
+
+        The build runs outside the lock so a slow build doesn't block other
+        sessions; two sessions missing the same key at once both build it.
+        """
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = build()
+            self.put(key, value)
+        return value
+
+    def values(self):
+        with self._lock:
+            return list(self._entries.values())
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self.total = 0
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "total": self.total,
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+_MISSING = object()
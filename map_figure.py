@@ -0,0 +1,90 @@
+"""Choropleth construction for the Map page, cached by filter state.
+
+Building the figure with plotly express dominates a Map rerun, so finished
+figures are kept as JSON in a shared LRU cache keyed by the dataset version and
+the (region, min, max) filter state, within a byte budget
+(``SLASH_BURN_FIGURE_CACHE_MB``). A hit only has to rehydrate the JSON.
+
+Sub-national rows are drawn on boundaries from ``geometry.py`` when they are
+available; otherwise plotly's built-in country outlines are used.
+"""
+import json
+import os
+
+import plotly.express as px
+import plotly.graph_objects as go
+import plotly.io as pio
+import streamlit as st
+
+from geometry import ADMIN_CODE_COLUMN
+from lru import LRUCache
+
+# Specs grow with the rows drawn (about 17 MB at a million), so the cache has a byte budget
+FIGURE_CACHE_BYTES = int(os.environ.get("SLASH_BURN_FIGURE_CACHE_MB", 256)) * 2**20
+
+
+def build_map_figure(df_filtered, geojson=None):
+    # Sub-national rows are matched to the boundary features by their admin code
+    locations = dict(locations="country_code")
+    if geojson is not None:
+        locations = dict(locations=ADMIN_CODE_COLUMN, geojson=geojson, featureidkey="id")
+
+    # Create the map
+    fig = px.choropleth(
+        df_filtered,
+        **locations,
+        color="slash_burn_prevalence",
+        hover_name="country_name",
+        color_continuous_scale=[[0, "white"], [1, "darkblue"]],
+        range_color=[0, 100],
+        labels={"slash_burn_prevalence": "Prevalence (%)"},
+        title="Slash-and-Burn Agriculture Prevalence by Country"
+    )
+
+    # Update layout
+    fig.update_layout(
+        margin={"r": 0, "t": 30, "l": 0, "b": 0},
+        coloraxis_colorbar=dict(
+            title="Prevalence",
+            tickvals=[0, 25, 50, 75, 100],
+            ticktext=["Not Common", "Low", "Moderate", "High", "Very Common"]
+        )
+    )
+    if geojson is not None and "bbox" in geojson:
+        # The boundaries were clipped to a region (see geometry.load_geometry), so show just that region
+        west, south, east, north = geojson["bbox"]
+        fig.update_geos(lonaxis_range=[west, east], lataxis_range=[south, north])
+    return fig
+
+
+@st.cache_resource(show_spinner=False)
+def figure_cache():
+    """Return the process-wide figure cache (one per server, shared by all sessions)."""
+    return LRUCache(FIGURE_CACHE_BYTES, sizeof=len)
+
+
+def figure_key(df_filtered, region, min_prevalence, max_prevalence, geometry_key=None):
+    return (df_filtered.attrs.get("version"), region, min_prevalence, max_prevalence, geometry_key)
+
+
+def cached_figure_spec(rows, region, min_prevalence, max_prevalence, geometry=None):
+    """Return the JSON spec of the choropleth for ``rows`` (``FilteredRows``), building it at most once.
+
+    The rows are only materialized on a cache miss. ``geometry`` is a
+    ``(key, geojson)`` pair from ``geometry.load_geometry()``.
+    """
+    geometry_key, geojson = geometry or (None, None)
+    key = figure_key(rows, region, min_prevalence, max_prevalence, geometry_key)
+    return figure_cache().get_or_build(
+        key, lambda: pio.to_json(build_map_figure(rows.frame(), geojson), validate=False)
+    )
+
+
+def cached_map_figure(rows, region, min_prevalence, max_prevalence, geometry=None):
+    """Return the choropleth for ``rows``, reusing a cached build if possible.
+
+    Every call returns a new Figure object, so callers may add traces to it.
+    """
+    spec = cached_figure_spec(rows, region, min_prevalence, max_prevalence, geometry)
+    # The spec was produced from a valid figure, so skip plotly's validation pass
+    return go.Figure(json.loads(spec), _validate=False)
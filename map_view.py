@@ -0,0 +1,209 @@
+"""Map page body: filters, choropleth and raw data.
+
+Everything here runs inside one ``st.fragment``, so moving a filter reruns only
+this part of the page instead of the whole script (navigation, data loading and
+the static sections are left alone).
+"""
+from typing import NamedTuple, Optional
+
+import plotly.io as pio
+import streamlit as st
+
+import memory
+import perf
+from aggregates import load_cube
+from data_store import PREVALENCE_DIR, TIMESERIES_DIR, has_detection_grid, load_detection_grid
+from export import EXPORT_FORMATS, cached_export, export_cache
+from filter_index import FilteredRows, load_filter_index
+from geometry import ADMIN_CODE_COLUMN, load_geometry
+from ingest import FINEST, RESOLUTIONS, cell_degrees
+from map_figure import cached_map_figure, figure_cache
+from query_backend import QUERY_BACKEND, query_filtered
+from raster import add_raster_layer
+from regions import REGION_BOUNDS, REGION_OPTIONS
+from timeseries import years
+
+
+class MapFilters(NamedTuple):
+    region: str
+    min_prevalence: int
+    max_prevalence: int
+    # None when there is no prevalence history / the detection layer is off
+    year: Optional[int]
+    detection_mode: Optional[str]
+    detection_resolution: Optional[int]
+
+
+def filter_controls(year_options=None):
+    """Draw the filter widgets and return the chosen ``MapFilters``."""
+    # Region filter (optional)
+    selected_region = st.selectbox("Select Region", REGION_OPTIONS, key="map_region")
+
+    # Prevalence threshold filter - a single range control, so one drag is one rerun
+    min_prevalence, max_prevalence = st.slider(
+        "Prevalence range", 0, 100, (0, 100), key="map_prevalence"
+    )
+
+    # Year of the prevalence history to show (latest by default)
+    year = None
+    if year_options:
+        year = st.select_slider("Year", options=year_options, value=year_options[-1], key="map_year")
+
+    # Fire detection density layer (precomputed by ingest.py)
+    detection_mode = detection_resolution = None
+    if has_detection_grid() and st.checkbox("Show fire detections", key="map_detections"):
+        # Raster draws every detection as one server-rendered image, for dense layers
+        detection_mode = st.radio(
+            "Detection rendering", ["Markers", "Raster"], horizontal=True, key="map_detection_mode"
+        )
+        if detection_mode == "Markers":
+            detection_resolution = st.select_slider(
+                "Detection grid",
+                options=list(RESOLUTIONS),
+                value=2,
+                format_func=lambda resolution: f"{cell_degrees(resolution):g}°",
+                key="map_detection_resolution"
+            )
+    return MapFilters(selected_region, min_prevalence, max_prevalence, year, detection_mode, detection_resolution)
+
+
+def add_detection_layer(fig, resolution):
+    grid = load_detection_grid(resolution)
+    fig.add_scattergeo(
+        lat=grid["lat"],
+        lon=grid["lon"],
+        mode="markers",
+        marker=dict(
+            size=4 + 2 * grid["intensity"],
+            color=grid["intensity"],
+            colorscale="YlOrRd",
+            opacity=0.7
+        ),
+        customdata=grid["detections"],
+        hovertemplate="%{customdata} fire detections<extra></extra>",
+        showlegend=False
+    )
+
+
+def summary_panel(region, summary, buckets):
+    """Show a region's statistics and its prevalence distribution by bucket."""
+    def percent(value):
+        return "–" if value != value else f"{value:.1f}%"
+
+    st.subheader(f"Summary: {region}")
+    st.metric("Mean prevalence", percent(summary["mean"]))
+    st.metric("Area-weighted mean", percent(summary["weighted_mean"]))
+    st.metric("Range", f"{percent(summary['min'])} – {percent(summary['max'])}")
+    st.metric("Countries", summary["countries"])
+    st.dataframe(
+        buckets[["bucket", "countries", "mean"]],
+        hide_index=True,
+        column_config={"mean": st.column_config.NumberColumn("mean", format="%.1f")}
+    )
+
+
+@st.fragment
+def map_view(df, ts=None):
+    """Draw the filters, map and raw data for ``df``.
+
+    With a prevalence history ``ts``, a year slider is added and the chosen
+    year's rows of ``ts`` are shown instead of ``df``.
+    """
+    year_options = years(ts) if ts is not None else None
+    col1, col2 = st.columns([3, 1])
+
+    with col2:
+        st.subheader("Filters")
+        # With the form, filter changes are batched until "Apply" is pressed
+        if st.checkbox("Apply filters with a button", key="map_use_form"):
+            with st.form("map_filters", border=False):
+                filters = filter_controls(year_options)
+                st.form_submit_button("Apply")
+        else:
+            filters = filter_controls(year_options)
+
+        # With a SQL backend configured, all predicates are pushed down into one query
+        rows = None
+        if QUERY_BACKEND != "pandas":
+            with perf.span("query_filter"):
+                result = query_filtered(
+                    filters.region, filters.min_prevalence, filters.max_prevalence, filters.year
+                )
+            rows = FilteredRows(result) if result is not None else None
+
+        if rows is None:
+            # A year is picked out of the history by the same index, without a snapshot copy
+            frame = df if filters.year is None else ts
+
+            # All filters are answered by the shared index instead of scanning the frame
+            index = load_filter_index(frame)
+            with perf.span("range_filter"):
+                positions = index.range_positions(
+                    filters.min_prevalence, filters.max_prevalence, filters.region, filters.year
+                )
+            with perf.span("table_order"):
+                positions = index.table_order(positions)
+            # The rows stay a view of the shared frame until something needs a DataFrame
+            rows = FilteredRows(frame, positions, filters.year)
+        df = rows.df
+
+        # Region statistics come from the precomputed cube, not from the rows
+        with perf.span("summary"):
+            cube = load_cube(PREVALENCE_DIR if filters.year is None else TIMESERIES_DIR)
+            summary = cube.summary(filters.region, filters.year)
+            buckets = cube.bucket_summaries(filters.region, filters.year)
+        summary_panel(filters.region, summary, buckets)
+
+    with col1:
+        # Create the map (shared across sessions for the same filter state)
+        with perf.span("figure_construction"):
+            # Sub-national boundaries are simplified to a detail level that suits the region
+            geometry = None
+            if ADMIN_CODE_COLUMN in df.columns:
+                geometry = load_geometry(REGION_BOUNDS[filters.region])
+            fig = cached_map_figure(
+                rows, filters.region, filters.min_prevalence, filters.max_prevalence, geometry
+            )
+
+            if filters.detection_mode == "Markers":
+                add_detection_layer(fig, filters.detection_resolution)
+            elif filters.detection_mode == "Raster":
+                add_raster_layer(
+                    fig, load_detection_grid(FINEST), REGION_BOUNDS[filters.region], cell_size=cell_degrees(FINEST)
+                )
+
+        # Measuring the payload repeats plotly_chart's serialization, so only when asked to
+        if perf.enabled():
+            with perf.span("chart_serialization"):
+                perf.record("payload_bytes", len(pio.to_json(fig, validate=False)))
+
+        # Display the map
+        with perf.span("chart_render"):
+            # The raster layer fixes the figure size so the image lines up with the map
+            st.plotly_chart(fig, use_container_width=filters.detection_mode != "Raster")
+
+    # Add download capability
+    if st.checkbox("Show raw data"):
+        st.write(rows.frame())
+        export_format = st.radio("Download format", list(EXPORT_FORMATS), horizontal=True, key="map_export_format")
+        extension, mime = EXPORT_FORMATS[export_format]
+        # Backends may select fewer columns, so their exports are cached separately
+        filter_key = (filters.region, filters.min_prevalence, filters.max_prevalence, filters.year, QUERY_BACKEND)
+        # The file is only produced when the button is clicked, and cached per filter state
+        st.download_button(
+            label=f"Download data as {export_format}",
+            data=lambda: cached_export(rows, filter_key, export_format),
+            file_name=f"slash_burn_data.{extension}",
+            mime=mime,
+            on_click="ignore"
+        )
+
+    if memory.enabled():
+        # The download button holds on to the filter result between reruns
+        session_sizes = memory.account_session({"filter_rows": rows})
+        perf.record("session_bytes", sum(session_sizes.values()))
+    entry = perf.finish()
+    if perf.debug_panel_enabled():
+        perf.debug_panel(entry, {"figures": figure_cache().stats(), "exports": export_cache().stats()})
+    if memory.enabled():
+        memory.memory_panel(session_sizes)
@@ -0,0 +1,155 @@
+"""Memory accounting for sizing deployments.
+
+With ``SLASH_BURN_MEMORY_ACCOUNTING`` set, every Map rerun measures what its
+session holds (session state plus the filter results kept for the download
+button). The total goes into the rerun's perf record, and so into the metrics
+file. A panel below the map lists the recently seen sessions and the size of
+every shared cache, which is paid once per server process no matter how many
+sessions there are.
+
+Sizes are estimates: pandas' deep memory usage, NumPy/Arrow buffer sizes and
+``sys.getsizeof`` for everything else. Objects reachable from several places
+are counted once.
+"""
+import os
+import sys
+import threading
+import time
+from collections import deque
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from filter_index import FilteredRows
+from lru import LRUCache
+
+MEMORY_ACCOUNTING = bool(os.environ.get("SLASH_BURN_MEMORY_ACCOUNTING"))
+# Sessions not seen for this long drop out of the report
+SESSION_TTL = 3600
+
+
+def enabled():
+    return MEMORY_ACCOUNTING
+
+
+def deep_sizeof(obj, seen=None):
+    """Estimate the bytes held by ``obj`` and everything it references, skipping ``seen`` ids."""
+    seen = set() if seen is None else seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    if isinstance(obj, pd.DataFrame):
+        return int(obj.memory_usage(deep=True).sum())
+    if isinstance(obj, pd.Series):
+        return int(obj.memory_usage(deep=True))
+    if isinstance(obj, np.ndarray):
+        # A view only holds its header; the buffer belongs to the array it views
+        return obj.nbytes if obj.base is None else sys.getsizeof(obj)
+    if isinstance(obj, (pa.Table, pa.RecordBatch)):
+        return obj.nbytes
+    if isinstance(obj, FilteredRows):
+        # The frame is shared; only the positions are the view's own
+        return sys.getsizeof(obj) + deep_sizeof(obj.positions, seen)
+    if isinstance(obj, LRUCache):
+        return sys.getsizeof(obj) + sum(deep_sizeof(value, seen) for value in obj.values())
+    if isinstance(obj, dict):
+        return sys.getsizeof(obj) + sum(
+            deep_sizeof(key, seen) + deep_sizeof(value, seen) for key, value in obj.items()
+        )
+    if isinstance(obj, (list, tuple, set, frozenset, deque)):
+        return sys.getsizeof(obj) + sum(deep_sizeof(item, seen) for item in obj)
+    if hasattr(obj, "__dict__") and not isinstance(obj, type):
+        return sys.getsizeof(obj) + deep_sizeof(vars(obj), seen)
+    return sys.getsizeof(obj)
+
+
+@st.cache_resource(show_spinner=False)
+def _session_sizes():
+    # session id -> (last seen, bytes)
+    return {}, threading.Lock()
+
+
+def account_session(held=None):
+    """Measure this session's state and ``held`` objects; return ``{name: bytes}``.
+
+    ``held`` names per-session objects kept beyond the rerun, like the filter
+    results captured by the download button. Shared frames they reference are
+    not counted.
+    """
+    sizes = {f"session_state.{key}": deep_sizeof(value) for key, value in st.session_state.items()}
+    for name, obj in (held or {}).items():
+        sizes[name] = deep_sizeof(obj)
+    ctx = get_script_run_ctx()
+    if ctx is not None:
+        registry, lock = _session_sizes()
+        with lock:
+            registry[ctx.session_id] = (time.time(), sum(sizes.values()))
+    return sizes
+
+
+def session_report():
+    """Return ``{session id: bytes}`` for sessions seen within ``SESSION_TTL``."""
+    registry, lock = _session_sizes()
+    cutoff = time.time() - SESSION_TTL
+    with lock:
+        for session_id in [key for key, (seen, _) in registry.items() if seen < cutoff]:
+            del registry[session_id]
+        return {session_id: size for session_id, (_, size) in registry.items()}
+
+
+def shared_report():
+    """Return ``{cache name: bytes}`` for the shared caches, counting shared objects once."""
+    from aggregates import _cube_registry
+    from data_store import PREVALENCE_DIR, TIMESERIES_DIR, _read_partition, current_signatures, load_data, load_timeseries
+    from export import export_cache
+    from filter_index import load_filter_index
+    from map_figure import figure_cache
+    from perf import recent_reruns
+    from raster import raster_cache
+
+    seen = set()
+    df, ts = load_data(), load_timeseries()
+    partitions = [
+        _read_partition(*signature)
+        for directory in (PREVALENCE_DIR, TIMESERIES_DIR)
+        for signature in current_signatures(directory)
+    ]
+    report = {
+        # Arrow buffers of .arrow partitions are memory-mapped (page cache, shared between processes)
+        "partitions (Arrow)": sum(deep_sizeof(table, seen) for table in partitions),
+        "prevalence frame": deep_sizeof(df, seen),
+        "history frame": deep_sizeof(ts, seen) if ts is not None else 0,
+        "filter index": deep_sizeof(load_filter_index(df), seen),
+        "history filter index": deep_sizeof(load_filter_index(ts), seen) if ts is not None else 0,
+        "aggregation cubes": deep_sizeof(_cube_registry()[0], seen),
+        "figures": deep_sizeof(figure_cache(), seen),
+        "exports": deep_sizeof(export_cache(), seen),
+        "rasters": deep_sizeof(raster_cache(), seen),
+        "recent reruns": deep_sizeof(recent_reruns(), seen),
+    }
+    return report
+
+
+def memory_panel(session_sizes):
+    """Show this session's bytes, all recent sessions and the shared caches."""
+    def megabytes(sizes):
+        return {name: round(size / 2**20, 3) for name, size in sizes.items()}
+
+    sessions = session_report()
+    shared = shared_report()
+    with st.expander("Memory accounting (MB)", expanded=True):
+        st.caption(
+            f"This session: {sum(session_sizes.values()) / 2**20:.3f} MB · "
+            f"{len(sessions)} recent sessions: {sum(sessions.values()) / 2**20:.3f} MB · "
+            f"shared caches: {sum(shared.values()) / 2**20:.1f} MB"
+        )
+        col1, col2, col3 = st.columns(3)
+        col1.write("This session")
+        col1.dataframe(megabytes(session_sizes))
+        col2.write("Sessions")
+        col2.dataframe(megabytes(sessions))
+        col3.write("Shared caches")
+        col3.dataframe(megabytes(shared))
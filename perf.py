@@ -0,0 +1,167 @@
+"""Per-rerun timing instrumentation for the Map page.
+
+Phases are timed with ``span()`` and collected into one record per rerun (or
+per fragment rerun). Finished records go to a process-wide ring buffer, which
+the opt-in debug panel summarises, and, if ``SLASH_BURN_METRICS_FILE`` is set,
+to a rotating JSON-lines file.
+
+Usage:
+    python perf.py metrics.jsonl    # p50/p95/p99 per phase across sessions
+"""
+import argparse
+import json
+import logging
+import logging.handlers
+import os
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import streamlit as st
+
+METRICS_FILE = os.environ.get("SLASH_BURN_METRICS_FILE")
+METRICS_FILE_BYTES = 10 * 2**20
+METRICS_FILE_BACKUPS = 5
+RECENT_RERUNS = 1000
+DEBUG_PANEL_KEY = "perf_debug_panel"
+_TIMINGS_KEY = "_perf_timings"
+
+
+class RerunTimings:
+    def __init__(self, page):
+        self.page = page
+        self.started = time.time()
+        self.phases = {}
+        self.values = {}
+        self.finished = False
+
+    @contextmanager
+    def span(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            self.phases[name] = self.phases.get(name, 0.0) + elapsed_ms
+
+    def as_record(self):
+        return {
+            "time": self.started,
+            "page": self.page,
+            "phases_ms": {name: round(ms, 3) for name, ms in self.phases.items()},
+            **self.values,
+        }
+
+
+def debug_panel_enabled():
+    return st.session_state.get(DEBUG_PANEL_KEY, False)
+
+
+def enabled():
+    """Return whether costly measurements (like payload size) should be taken."""
+    return bool(METRICS_FILE) or debug_panel_enabled()
+
+
+def begin(page):
+    """Start a new timing record for a full rerun of ``page``."""
+    timings = RerunTimings(page)
+    st.session_state[_TIMINGS_KEY] = timings
+    return timings
+
+
+def current(page="Map"):
+    """Return this session's timings for the rerun in progress, starting one if needed."""
+    timings = st.session_state.get(_TIMINGS_KEY)
+    if timings is None or timings.finished:
+        timings = RerunTimings(page)
+        st.session_state[_TIMINGS_KEY] = timings
+    return timings
+
+
+def span(name):
+    """Time the enclosed block as phase ``name`` of the current rerun."""
+    return current().span(name)
+
+
+def record(name, value):
+    current().values[name] = value
+
+
+@st.cache_resource(show_spinner=False)
+def recent_reruns():
+    """Return the process-wide buffer of recent rerun records (all sessions)."""
+    return deque(maxlen=RECENT_RERUNS)
+
+
+@st.cache_resource(show_spinner=False)
+def _metrics_logger():
+    logger = logging.getLogger("slash_burn.metrics")
+    logger.propagate = False
+    handler = logging.handlers.RotatingFileHandler(
+        METRICS_FILE, maxBytes=METRICS_FILE_BYTES, backupCount=METRICS_FILE_BACKUPS
+    )
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    return logger
+
+
+def finish():
+    """Close the current rerun's record and publish it."""
+    timings = current()
+    timings.finished = True
+    entry = timings.as_record()
+    recent_reruns().append(entry)
+    if METRICS_FILE:
+        _metrics_logger().info(json.dumps(entry))
+    return entry
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    if not ordered:
+        return float("nan")
+    return ordered[min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))]
+
+
+def summarize(entries, quantiles=(50, 99)):
+    """Return ``{phase: {"n": count, "p50": ms, ...}}`` over rerun records."""
+    samples = {}
+    for entry in entries:
+        for phase, ms in entry["phases_ms"].items():
+            samples.setdefault(phase, []).append(ms)
+    return {
+        phase: {"n": len(values), **{f"p{q}": percentile(values, q) for q in quantiles}}
+        for phase, values in samples.items()
+    }
+
+
+def debug_panel(entry, cache_stats=None):
+    """Show the last rerun's phases and the p50/p99 over recent reruns of all sessions.
+
+    ``cache_stats`` maps cache names to ``LRUCache.stats()`` results.
+    """
+    with st.expander("Timing debug panel", expanded=True):
+        st.write({name: f"{ms:.1f} ms" for name, ms in entry["phases_ms"].items()})
+        if "payload_bytes" in entry:
+            st.caption(f"Figure payload: {entry['payload_bytes']:,} bytes")
+        st.dataframe(summarize(list(recent_reruns())))
+        if cache_stats:
+            st.dataframe(cache_stats)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarize a Map page metrics file")
+    parser.add_argument("paths", nargs="+", help="JSON-lines metrics files (including rotated ones)")
+    args = parser.parse_args()
+    entries = []
+    for path in args.paths:
+        with open(path) as lines:
+            entries.extend(json.loads(line) for line in lines if line.strip())
+    print(f"{'phase':<22}{'n':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for phase, stats in summarize(entries, (50, 95, 99)).items():
+        print(f"{phase:<22}{stats['n']:>8}{stats['p50']:>10.2f}{stats['p95']:>10.2f}{stats['p99']:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,265 @@
+"""Prerender every page of app.py into a static HTML bundle.
+
+The text pages never change between sessions, and the Map page's filters can
+run entirely in the browser (see ``client_map.py``). So the whole app can be
+exported once per dataset version and served by any static file server or CDN,
+with no Python process per user:
+
+- each text page's ``render()`` runs against a recorder standing in for
+  ``st``, and its calls are written out as HTML;
+- the Map page is the client-side filterable map, with the region and
+  threshold controls built in (plus a year animation page with a history);
+- plotly.js is written once as ``plotly.min.js`` and shared by the map pages.
+
+Usage:
+    python prerender.py site/
+"""
+import argparse
+import html
+import importlib
+import re
+import textwrap
+from pathlib import Path
+from unittest import mock
+
+from plotly.offline import get_plotlyjs
+
+from views import APP_INFO, PAGES
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>{title} · Biodiversity and Slash-and-Burn Agriculture</title>
+<style>
+  body {{ font-family: "Source Sans Pro", sans-serif; margin: 0; color: #31333f; line-height: 1.6; }}
+  nav {{ background: #f0f2f6; padding: 0.75rem 2rem; display: flex; gap: 1.25rem; flex-wrap: wrap; }}
+  nav a {{ color: #31333f; text-decoration: none; }}
+  nav a[aria-current] {{ font-weight: 600; color: #0068c9; }}
+  main {{ max-width: 1200px; margin: 0 auto; padding: 1rem 2rem; }}
+  .row {{ display: flex; gap: 2rem; flex-wrap: wrap; }}
+  .row > div {{ flex: 1; min-width: 240px; }}
+  .info {{ background: #e8f2fc; border-radius: 0.5rem; padding: 0.25rem 1rem; }}
+</style>
+</head>
+<body>
+<nav>{nav}</nav>
+<main>
+{body}
+<hr>
+<h3>About This Application</h3>
+<div class="info">{info}</div>
+</main>
+</body>
+</html>
+"""
+
+PLOTLY_JS = "plotly.min.js"
+ANIMATION_PAGE = ("Map over Years", "years.html")
+
+
+def _inline(text):
+    text = html.escape(text, quote=False)
+    text = re.sub(r"`([^`]+)`", r"<code>\1</code>", text)
+    text = re.sub(r"\*\*(.+?)\*\*", r"<strong>\1</strong>", text)
+    text = re.sub(r"\*(.+?)\*", r"<em>\1</em>", text)
+    return re.sub(r"\[([^\]]+)\]\(([^)\s]+)\)", r'<a href="\2">\1</a>', text)
+
+
+def markdown_to_html(text):
+    """Convert the markdown the pages use (paragraphs, headings, lists, emphasis, links).
+
+    Like ``st.markdown``, the text is dedented first.
+    """
+    blocks, paragraph, items, list_tag = [], [], [], None
+
+    def flush():
+        nonlocal items, paragraph, list_tag
+        if paragraph:
+            blocks.append(f"<p>{_inline(' '.join(paragraph))}</p>")
+        if items:
+            blocks.append(f"<{list_tag}>" + "".join(f"<li>{_inline(item)}</li>" for item in items) + f"</{list_tag}>")
+        paragraph, items, list_tag = [], [], None
+
+    for line in textwrap.dedent(text).strip().splitlines():
+        line = line.strip()
+        heading = re.match(r"(#{1,6})\s+(.*)", line)
+        item = re.match(r"([-*+]|\d+\.)\s+(.*)", line)
+        if not line or line == "---":
+            flush()
+            if line:
+                blocks.append("<hr>")
+        elif heading:
+            flush()
+            level = len(heading.group(1))
+            blocks.append(f"<h{level}>{_inline(heading.group(2))}</h{level}>")
+        elif item:
+            tag = "ol" if item.group(1)[0].isdigit() else "ul"
+            if paragraph or tag != list_tag:
+                flush()
+            list_tag = tag
+            items.append(item.group(2))
+        elif items:
+            # A continuation line of the previous item
+            items[-1] += " " + line
+        else:
+            paragraph.append(line)
+    flush()
+    return "\n".join(blocks)
+
+
+class StaticPage:
+    """Records the ``st`` calls the text pages make and renders them as HTML.
+
+    Only the elements those pages use are supported; anything else raises
+    ``AttributeError``, so a page that needs a server is noticed at export time.
+    """
+
+    def __init__(self):
+        self.parts = []
+        self._containers = [self.parts]
+
+    def _add(self, part):
+        self._containers[-1].append(part)
+
+    def title(self, text):
+        self._add(f"<h1>{_inline(text)}</h1>")
+
+    def header(self, text):
+        self._add(f"<h2>{_inline(text)}</h2>")
+
+    def subheader(self, text):
+        self._add(f"<h3>{_inline(text)}</h3>")
+
+    def markdown(self, text):
+        self._add(markdown_to_html(text))
+
+    write = markdown
+
+    def info(self, text):
+        self._add(f'<div class="info">{markdown_to_html(text)}</div>')
+
+    def html(self, text):
+        self._add(text)
+
+    def columns(self, spec):
+        columns = [_Column(self) for _ in range(spec if isinstance(spec, int) else len(spec))]
+        self._add(columns)
+        return columns
+
+    def to_html(self, parts=None):
+        rendered = []
+        for part in self.parts if parts is None else parts:
+            if isinstance(part, list):
+                cells = "".join(f"<div>{self.to_html(column.parts)}</div>" for column in part)
+                rendered.append(f'<div class="row">{cells}</div>')
+            else:
+                rendered.append(part)
+        return "\n".join(rendered)
+
+
+class _Column:
+    def __init__(self, page):
+        self.page = page
+        self.parts = []
+
+    def __enter__(self):
+        self.page._containers.append(self.parts)
+        return self
+
+    def __exit__(self, *exc_info):
+        self.page._containers.pop()
+
+    def __getattr__(self, name):
+        # col.markdown(...) is the same as calling st.markdown inside "with col:"
+        element = getattr(self.page, name)
+
+        def call(*args, **kwargs):
+            with self:
+                return element(*args, **kwargs)
+        return call
+
+
+def page_filename(name):
+    # The first page (the Map) is the bundle's index
+    if name == next(iter(PAGES)):
+        return "index.html"
+    return PAGES[name].rsplit(".", 1)[-1] + ".html"
+
+
+def render_text_page(module_name):
+    """Run a text page's ``render()`` against a ``StaticPage``; return its HTML body."""
+    module = importlib.import_module(module_name)
+    page = StaticPage()
+    with mock.patch.object(module, "st", page):
+        module.render()
+    return page.to_html()
+
+
+def render_map_pages():
+    """Return ``{filename: HTML body}`` for the client-side map and, with a history, the animation."""
+    # Imported here so exporting doesn't load the data until the text pages are done
+    from client_map import client_animation_html, client_map_html
+    from data_store import load_data, load_timeseries
+    from views.map import INTRO, TITLE
+
+    page = StaticPage()
+    page.title(TITLE)
+    page.markdown(INTRO)
+    page.html(client_map_html(load_data(), include_plotlyjs="directory"))
+    bodies = {page_filename("Map"): page.to_html()}
+
+    ts = load_timeseries()
+    if ts is not None:
+        page = StaticPage()
+        page.title(TITLE)
+        page.markdown(INTRO)
+        page.html(client_animation_html(ts, include_plotlyjs="directory"))
+        bodies[ANIMATION_PAGE[1]] = page.to_html()
+    return bodies
+
+
+def _write(path, text):
+    # Replaced in one step, so a server never hands out a half-written page
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    tmp_path.write_text(text, encoding="utf-8")
+    tmp_path.replace(path)
+
+
+def export(directory):
+    """Write the static bundle into ``directory``; return the paths written."""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    bodies = {page_filename(name): render_text_page(module) for name, module in PAGES.items() if name != "Map"}
+    bodies.update(render_map_pages())
+
+    links = [(name, page_filename(name)) for name in PAGES]
+    if ANIMATION_PAGE[1] in bodies:
+        links.insert(1, ANIMATION_PAGE)
+    titles = dict((filename, name) for name, filename in links)
+    info = markdown_to_html(APP_INFO)
+
+    paths = [directory / PLOTLY_JS]
+    _write(paths[0], get_plotlyjs())
+    for filename, body in bodies.items():
+        nav = "".join(
+            f'<a href="{href}"{" aria-current=page" if href == filename else ""}>{html.escape(name)}</a>'
+            for name, href in links
+        )
+        path = directory / filename
+        _write(path, PAGE_TEMPLATE.format(title=html.escape(titles[filename]), nav=nav, body=body, info=info))
+        paths.append(path)
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prerender the app into a static HTML bundle")
+    parser.add_argument("directory", help="output directory (created if missing)")
+    args = parser.parse_args()
+    for path in export(args.directory):
+        print(f"Wrote {path} ({path.stat().st_size:,} bytes)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+"""Optional SQL backends for the Map page's filters.
+
+By default the Map page filters the shared pandas frame through ``FilterIndex``.
+Setting ``SLASH_BURN_QUERY_BACKEND`` to ``duckdb`` or ``sqlite`` makes it push
+the region, prevalence-range and year predicates down into a query instead, so
+only the matching rows and the columns the map and raw-data table use are
+materialized:
+
+* ``duckdb`` (needs the ``duckdb`` package) scans the partitions in place:
+  Parquet files directly, Arrow IPC files through their memory-mapped tables.
+* ``sqlite`` (standard library) compiles the partitions into an indexed
+  database file under ``data/query/``. The file is rebuilt when a partition
+  changes.
+
+Both return frames shaped like the pandas path, so figures, exports and their
+caches work the same on any backend.
+"""
+import json
+import os
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+
+import pandas as pd
+import streamlit as st
+
+from data_store import (
+    CATEGORICAL_COLUMNS,
+    DATA_DIR,
+    PREVALENCE_DIR,
+    TIMESERIES_DIR,
+    _read_partition,
+    current_signatures,
+)
+from geometry import ADMIN_CODE_COLUMN
+from regions import REGIONS
+
+QUERY_BACKENDS = ("pandas", "duckdb", "sqlite")
+QUERY_BACKEND = os.environ.get("SLASH_BURN_QUERY_BACKEND", "pandas")
+QUERY_DIR = DATA_DIR / "query"
+# Columns the map and the raw-data table use, in display order
+QUERY_COLUMNS = ["country_code", "country_name", ADMIN_CODE_COLUMN, "year", "slash_burn_prevalence"]
+INSERT_BATCH_ROWS = 100_000
+
+if QUERY_BACKEND not in QUERY_BACKENDS:
+    raise ValueError(f"SLASH_BURN_QUERY_BACKEND must be one of {QUERY_BACKENDS}, not {QUERY_BACKEND!r}")
+
+
+def quote(name):
+    return '"' + name.replace('"', '""') + '"'
+
+
+def literal(text):
+    return "'" + text.replace("'", "''") + "'"
+
+
+def where_clause(region, low, high, year=None):
+    """Return ``(sql, params)`` for the filter predicates, using ``?`` placeholders."""
+    predicates = ["slash_burn_prevalence BETWEEN ? AND ?"]
+    params = [low, high]
+    if region != "All":
+        codes = REGIONS[region]
+        predicates.append(f"country_code IN ({', '.join('?' * len(codes))})")
+        params.extend(codes)
+    if year is not None:
+        predicates.append("year = ?")
+        params.append(year)
+    return " AND ".join(predicates), params
+
+
+def selected_columns(schema_names):
+    return [name for name in QUERY_COLUMNS if name in schema_names]
+
+
+class DuckDBBackend:
+    """Queries the partitions in place with an in-process DuckDB connection."""
+
+    def __init__(self, signatures):
+        import duckdb
+
+        self.connection = duckdb.connect()
+        # IPC files are registered as their memory-mapped Arrow tables (no copy)
+        self.tables = {}
+        scans = []
+        for i, (path, mtime_ns, size) in enumerate(signatures):
+            if path.endswith(".parquet"):
+                # Parquet is scanned directly, so row groups are skipped by their statistics
+                scans.append(f"SELECT * FROM read_parquet({literal(path)})")
+            else:
+                self.tables[f"partition_{i}"] = _read_partition(path, mtime_ns, size)
+                scans.append(f"SELECT * FROM partition_{i}")
+        self._register(self.connection)
+        self.connection.execute(f"CREATE VIEW prevalence AS {' UNION ALL BY NAME '.join(scans)}")
+        schema_names = [row[0] for row in self.connection.execute("DESCRIBE prevalence").fetchall()]
+        self.columns = selected_columns(schema_names)
+
+    def query(self, region, low, high, year=None):
+        where, params = where_clause(region, low, high, year)
+        sql = f"SELECT {', '.join(map(quote, self.columns))} FROM prevalence WHERE {where}"
+        # A cursor is a separate connection to the same database, safe per thread
+        with self.connection.cursor() as cursor:
+            self._register(cursor)
+            return cursor.execute(sql, params).df()
+
+    def _register(self, connection):
+        # Registered tables are only visible to the connection that registered them
+        for name, table in self.tables.items():
+            connection.register(name, table)
+
+
+class SQLiteBackend:
+    """Queries an indexed SQLite copy of the partitions' map columns."""
+
+    def __init__(self, signatures, name):
+        self.path = Path(QUERY_DIR) / f"{name}.sqlite"
+        self.version = json.dumps(signatures)
+        if not self._is_current():
+            self._build(signatures)
+        with closing(self._connect()) as connection:
+            self.columns = [row[1] for row in connection.execute("PRAGMA table_info(prevalence)")]
+
+    def _connect(self):
+        return sqlite3.connect(f"file:{self.path}?mode=ro", uri=True, check_same_thread=False)
+
+    def _is_current(self):
+        if not self.path.exists():
+            return False
+        with closing(self._connect()) as connection:
+            return connection.execute("SELECT version FROM meta").fetchone()[0] == self.version
+
+    def _build(self, signatures):
+        """Copy the needed columns into a new database, then move it into place."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".sqlite.tmp")
+        tmp_path.unlink(missing_ok=True)
+        connection = sqlite3.connect(tmp_path)
+        try:
+            created = False
+            for signature in signatures:
+                table = _read_partition(*signature)
+                if not created:
+                    columns = selected_columns(table.column_names)
+                    connection.execute(f"CREATE TABLE prevalence ({', '.join(map(quote, columns))})")
+                    created = True
+                insert = f"INSERT INTO prevalence VALUES ({', '.join('?' * len(columns))})"
+                for batch in table.select(columns).to_batches(INSERT_BATCH_ROWS):
+                    connection.executemany(insert, zip(*(column.to_pylist() for column in batch.columns)))
+            connection.execute("CREATE INDEX prevalence_value ON prevalence (slash_burn_prevalence)")
+            connection.execute("CREATE INDEX prevalence_country ON prevalence (country_code)")
+            if "year" in columns:
+                connection.execute("CREATE INDEX prevalence_year ON prevalence (year, slash_burn_prevalence)")
+            connection.execute("CREATE TABLE meta (version TEXT)")
+            connection.execute("INSERT INTO meta VALUES (?)", (self.version,))
+            connection.commit()
+        finally:
+            connection.close()
+        os.replace(tmp_path, self.path)
+
+    def query(self, region, low, high, year=None):
+        where, params = where_clause(region, low, high, year)
+        # rowid order is partition order, as on the pandas path
+        sql = f"SELECT {', '.join(map(quote, self.columns))} FROM prevalence WHERE {where} ORDER BY rowid"
+        with closing(self._connect()) as connection:
+            return pd.read_sql_query(sql, connection, params=params)
+
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def _open_backend(backend, name, signatures):
+    if backend == "duckdb":
+        return DuckDBBackend(signatures)
+    return SQLiteBackend(signatures, name)
+
+
+def query_filtered(region, low, high, year=None, signatures=None):
+    """Return the matching rows from the configured SQL backend.
+
+    ``None`` means the pandas path should filter instead: it is the configured
+    backend, or there are no partitions to query (the built-in sample data).
+    ``signatures`` selects a snapshot of the queried directory other than the current one.
+    The frame's ``version`` is the queried snapshot (and year), so cached
+    figures and exports tell the results of different snapshots apart.
+    """
+    if QUERY_BACKEND == "pandas":
+        return None
+    directory = PREVALENCE_DIR if year is None else TIMESERIES_DIR
+    if signatures is None:
+        signatures = current_signatures(directory)
+    if not signatures:
+        return None
+    frame = _open_backend(QUERY_BACKEND, directory.name, signatures).query(region, low, high, year)
+    # Same dtypes as load_data()'s frame
+    frame = frame.astype({name: "category" for name in CATEGORICAL_COLUMNS if name in frame.columns})
+    frame.attrs["version"] = signatures if year is None else (signatures, year)
+    return frame
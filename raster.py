@@ -0,0 +1,163 @@
+"""Server-side rasterization of dense point layers, datashader style.
+
+Points (here: the finest fire-detection grid, weighted by count) are binned into
+a fixed-size pixel grid with NumPy, shaded on a log scale and sent to the
+browser as one PNG laid over the choropleth. The payload depends on the image
+size only, never on the number of points. Images are cached per dataset
+version, viewport and size, so they are only re-rasterized when those change.
+
+Grid cells are not points: a regional viewport has pixels smaller than a cell,
+and the world viewport has pixels that don't divide evenly into cells. Each
+cell's weight is therefore spread over the pixels it covers, in proportion to
+the overlap. Uniform data then shades uniformly at any zoom, instead of as a
+dotted lattice or moiré stripes.
+"""
+import base64
+import io
+
+import numpy as np
+import streamlit as st
+from PIL import Image
+
+from lru import LRUCache
+
+RASTER_WIDTH = 900
+RASTER_CACHE_SIZE = 32
+RASTER_MARGIN_RIGHT = 110
+
+# YlOrRd control points, from light to dark
+COLORMAP = np.array([
+    [255, 255, 178],
+    [254, 204, 92],
+    [253, 141, 60],
+    [240, 59, 32],
+    [189, 0, 38],
+], dtype=float)
+
+
+def raster_shape(viewport, width=RASTER_WIDTH):
+    """Return ``(height, width)`` in pixels for a ``(lat0, lat1, lon0, lon1)`` viewport.
+
+    Pixels are square in degrees, matching the equirectangular projection.
+    """
+    lat0, lat1, lon0, lon1 = viewport
+    return max(1, round(width * (lat1 - lat0) / (lon1 - lon0))), width
+
+
+def _coverage(start, stop, offset):
+    """Return pixel ``floor(start) + offset`` and the share of ``[start, stop)`` it covers."""
+    pixel = np.floor(start).astype(np.int64) + offset
+    overlap = np.minimum(stop, pixel + 1) - np.maximum(start, pixel)
+    return pixel, np.clip(overlap, 0, None) / (stop - start)
+
+
+def rasterize(lat, lon, weights, viewport, width=RASTER_WIDTH, cell_size=0):
+    """Sum ``weights`` into a ``(height, width)`` grid over ``viewport``; row 0 is the north edge.
+
+    With ``cell_size`` (degrees), every ``(lat, lon)`` is the centre of a grid
+    cell whose weight is split over the pixels the cell overlaps; otherwise
+    each weight lands in the pixel containing its point.
+    """
+    lat0, lat1, lon0, lon1 = viewport
+    height, width = raster_shape(viewport, width)
+    # Pixel coordinates of each cell's west/east and north/south edges
+    x_scale, y_scale = width / (lon1 - lon0), height / (lat1 - lat0)
+    x0, y0 = (lon - cell_size / 2 - lon0) * x_scale, (lat1 - lat - cell_size / 2) * y_scale
+    if not cell_size:
+        col, row = np.floor(x0).astype(np.int64), np.floor(y0).astype(np.int64)
+        inside = (col >= 0) & (col < width) & (row >= 0) & (row < height)
+        counts = np.bincount(
+            row[inside] * width + col[inside], weights=weights[inside], minlength=height * width
+        )
+        return counts.reshape(height, width)
+
+    x1, y1 = x0 + cell_size * x_scale, y0 + cell_size * y_scale
+    visible = (x1 > 0) & (x0 < width) & (y1 > 0) & (y0 < height)
+    x0, x1, y0, y1, weights = x0[visible], x1[visible], y0[visible], y1[visible], weights[visible]
+    counts = np.zeros(height * width)
+    # A cell spans at most this many pixels per axis
+    for row_offset in range(int(np.ceil(cell_size * y_scale)) + 1):
+        row, row_share = _coverage(y0, y1, row_offset)
+        for col_offset in range(int(np.ceil(cell_size * x_scale)) + 1):
+            col, col_share = _coverage(x0, x1, col_offset)
+            share = weights * row_share * col_share
+            inside = (share > 0) & (col >= 0) & (col < width) & (row >= 0) & (row < height)
+            counts += np.bincount(
+                row[inside] * width + col[inside], weights=share[inside], minlength=height * width
+            )
+    return counts.reshape(height, width)
+
+
+def shade(counts, alpha=210):
+    """Map counts to RGBA on a log scale; empty pixels are transparent."""
+    scaled = np.log1p(counts)
+    peak = scaled.max()
+    if peak > 0:
+        scaled /= peak
+    stops = np.linspace(0, 1, len(COLORMAP))
+    rgba = np.zeros(counts.shape + (4,), dtype=np.uint8)
+    for channel in range(3):
+        rgba[..., channel] = np.interp(scaled, stops, COLORMAP[:, channel])
+    rgba[..., 3] = np.where(counts > 0, alpha, 0)
+    return rgba
+
+
+def png_data_uri(rgba):
+    buffer = io.BytesIO()
+    Image.fromarray(rgba, "RGBA").save(buffer, format="PNG", optimize=True)
+    return "data:image/png;base64," + base64.b64encode(buffer.getvalue()).decode("ascii")
+
+
+@st.cache_resource(show_spinner=False)
+def raster_cache():
+    """Return the process-wide cache of rendered layers (shared by all sessions)."""
+    return LRUCache(RASTER_CACHE_SIZE)
+
+
+def cached_raster(points, viewport, width=RASTER_WIDTH, cell_size=0):
+    """Return the PNG data URI for ``points`` (lat, lon, detections) over ``viewport``."""
+    key = (points.attrs.get("version"), viewport, width, cell_size)
+    return raster_cache().get_or_build(key, lambda: png_data_uri(shade(rasterize(
+        points["lat"].to_numpy(dtype="float64"),
+        points["lon"].to_numpy(dtype="float64"),
+        points["detections"].to_numpy(dtype="float64"),
+        viewport,
+        width,
+        cell_size,
+    ))))
+
+
+def add_raster_layer(fig, points, viewport, width=RASTER_WIDTH, cell_size=0):
+    """Overlay the rasterized ``points`` on ``fig``'s map, zoomed to ``viewport``.
+
+    ``points`` are grid cell centres when ``cell_size`` (degrees) is given.
+
+    The figure is switched to an equirectangular projection sized to the image,
+    so the geo subplot fills the plot area exactly and the image lines up.
+    """
+    lat0, lat1, lon0, lon1 = viewport
+    height, width = raster_shape(viewport, width)
+    # Fixed margins (room for the title and colorbar) keep the plot area at the image size
+    margin = dict(l=0, r=RASTER_MARGIN_RIGHT, t=30, b=0, autoexpand=False)
+    fig.update_layout(
+        margin=margin,
+        width=width + margin["l"] + margin["r"],
+        height=height + margin["t"] + margin["b"],
+    )
+    fig.update_geos(
+        projection_type="equirectangular",
+        lataxis_range=[lat0, lat1],
+        lonaxis_range=[lon0, lon1],
+        domain=dict(x=[0, 1], y=[0, 1]),
+    )
+    fig.add_layout_image(
+        source=cached_raster(points, viewport, width, cell_size),
+        xref="paper",
+        yref="paper",
+        x=0,
+        y=1,
+        sizex=1,
+        sizey=1,
+        sizing="stretch",
+        layer="above",
+    )
@@ -0,0 +1,41 @@
+"""Region groupings for the map's region filter, derived from the country dimension table."""
+import numpy as np
+
+from countries import COUNTRIES, country_ids
+
+# Regions are continents; "All" is handled by the filters themselves and is not listed here
+REGION_ORDER = ["North America", "South America", "Europe", "Asia", "Oceania", "Africa"]
+
+# Region -> ISO-3 codes of its countries
+REGIONS = {
+    region: COUNTRIES.loc[COUNTRIES["continent"] == region, "iso3"].tolist()
+    for region in REGION_ORDER
+}
+
+# Region number of every country id: 1 + position in REGION_ORDER, 0 for none (Antarctica)
+_COUNTRY_REGION = np.zeros(len(COUNTRIES) + 1, dtype=np.int8)
+for number, region in enumerate(REGION_ORDER, start=1):
+    _COUNTRY_REGION[:-1][(COUNTRIES["continent"] == region).to_numpy()] = number
+
+
+def region_numbers(codes):
+    """Return the region number of every ISO-3 code in ``codes`` (0 for no region or unknown codes).
+
+    An integer join through the country dimension; categorical columns are resolved per category.
+    """
+    # Unknown codes have id -1, which picks the trailing 0
+    return _COUNTRY_REGION[country_ids(codes)]
+
+
+REGION_OPTIONS = ["All", *REGIONS]
+
+# Map viewport per region as (min lat, max lat, min lon, max lon)
+REGION_BOUNDS = {
+    "All": (-60, 85, -180, 180),
+    "North America": (5, 75, -170, -50),
+    "South America": (-57, 15, -95, -30),
+    "Europe": (34, 75, -25, 100),
+    "Asia": (-12, 55, 60, 150),
+    "Oceania": (-50, 0, 110, 180),
+    "Africa": (-36, 38, -20, 55)
+}
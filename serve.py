@@ -0,0 +1,26 @@
+"""Start the Streamlit server with its caches warming in the background.
+
+``streamlit run`` only executes the app once the first session connects, so
+the first user would pay for loading the data and building figures. This
+launcher starts the warm-up in the server process before serving.
+
+Usage:
+    python serve.py                                   # serves app.py
+    python serve.py streamlit-slash-burn-map.py --server.port 8502
+"""
+import sys
+from pathlib import Path
+
+from streamlit.web import cli
+
+import warmup
+import watcher
+
+if __name__ == "__main__":
+    script, *options = sys.argv[1:] or ["app.py"]
+    if script.startswith("-"):
+        script, options = "app.py", sys.argv[1:]
+    warmup.start()
+    watcher.start()
+    sys.argv = ["streamlit", "run", str(Path(__file__).parent / script), *options]
+    sys.exit(cli.main())
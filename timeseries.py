@@ -0,0 +1,54 @@
+"""Years and delta-encoded animation frames for the prevalence history.
+
+The history table is long format: one row per (country, year). The Map page
+filters one year of it through the shared filter index, and the animation
+sends one full base frame followed, for every later year, only the countries
+whose value changed.
+"""
+import numpy as np
+import streamlit as st
+
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def _years(version, _ts):
+    return sorted(_ts["year"].unique().tolist())
+
+
+def years(ts):
+    """Return the sorted years covered by ``ts``."""
+    return _years(ts.attrs.get("version"), ts)
+
+
+def delta_frames(ts):
+    """Encode the history as a base frame plus per-year changes.
+
+    Returns a dict with ``codes`` and ``names`` (one entry per country),
+    ``years``, ``base`` (values for the first year, ``None`` where missing) and
+    ``deltas``: for every following year, ``[country index, new value]`` pairs
+    for the countries whose value differs from the year before.
+    """
+    wide = ts.pivot_table(
+        index="country_code", columns="year", values="slash_burn_prevalence", aggfunc="last", observed=True
+    ).sort_index(axis=1)
+    names = ts.drop_duplicates("country_code", keep="last").set_index("country_code")["country_name"]
+    values = wide.to_numpy(dtype="float64")
+    missing = np.isnan(values)
+
+    # A value changed if it differs from the previous year, treating NaN == NaN
+    changed = (values[:, 1:] != values[:, :-1]) & ~(missing[:, 1:] & missing[:, :-1])
+
+    def as_json(column, rows):
+        return [None if np.isnan(value) else float(value) for value in values[rows, column]]
+
+    deltas = []
+    for column in range(1, values.shape[1]):
+        rows = np.flatnonzero(changed[:, column - 1])
+        deltas.append([[int(row), value] for row, value in zip(rows, as_json(column, rows))])
+
+    return {
+        "codes": wide.index.tolist(),
+        "names": names.reindex(wide.index).tolist(),
+        "years": [int(year) for year in wide.columns],
+        "base": as_json(0, slice(None)),
+        "deltas": deltas,
+    }
@@ -0,0 +1,17 @@
+"""Per-page modules for app.py, each exposing ``render()``."""
+
+# Page modules - imported on first visit, so a text page never waits for pandas or plotly
+PAGES = {
+    "Map": "views.map",
+    "About": "views.about",
+    "Environmental Effects": "views.environmental_effects",
+    "Sustainable Solutions": "views.sustainable_solutions",
+    "Implementation": "views.implementation",
+    "SDG Alignment": "views.sdg_alignment"
+}
+
+APP_INFO = """
+This application visualizes slash-and-burn agriculture prevalence and presents sustainable alternatives using agroforestry with Inga trees.
+
+**Note:** The map data is for demonstration purposes. For a production application, you should replace this with verified data from credible sources.
+"""
@@ -0,0 +1,37 @@
+"""About page: introduction to biodiversity and slash-and-burn agriculture."""
+import streamlit as st
+
+
+def render():
+    st.title("Biodiversity and Agriculture")
+    
+    st.header("Introduction and Overview")
+    st.markdown("""
+    Biodiversity refers to the variety of life on Earth, encompassing all species of plants, animals, fungi, and microorganisms, as well as the ecosystems they form. It plays a crucial role in maintaining ecological balance by supporting essential processes such as pollination, nutrient cycling, and climate regulation. A rich biodiversity ensures ecosystem resilience, allowing nature to adapt to changes and disturbances.
+
+    Agriculture, the practice of cultivating soil, growing crops, and raising livestock, provides food, fiber, and other essential resources for human survival. It has been a fundamental part of civilization for thousands of years, evolving from traditional farming methods to modern, technology-driven agricultural systems. Advances in irrigation, fertilizers, and genetically modified crops have significantly increased food production, helping to sustain a growing global population. However, agricultural expansion and certain farming practices, such as slash-and-burn, can negatively impact biodiversity and the environment.
+    """)
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.subheader("What is Slash-and-Burn Agriculture?")
+        st.markdown("""
+        Slash-and-burn agriculture is a traditional farming method where:
+        - Forests or grasslands are cleared by cutting down vegetation
+        - The cleared biomass is then burned
+        - Crops are planted in the ash-fertilized soil
+        - Land is abandoned after a few years when soil fertility declines
+        - New land is cleared, continuing the cycle
+        """)
+    
+    with col2:
+        st.subheader("Global Impact")
+        st.markdown("""
+        This practice is most common in:
+        - Tropical regions of South America (especially Brazil)
+        - Southeast Asia (Indonesia, Malaysia, Thailand)
+        - Central Africa (DR Congo, Madagascar)
+        
+        It accounts for an estimated 5% of global deforestation annually.
+        """)
@@ -0,0 +1,50 @@
+"""Environmental Effects page."""
+import streamlit as st
+
+
+def render():
+    st.title("Environmental Effects of Slash-and-Burn Agriculture")
+    
+    st.markdown("""
+    Slash-and-burn agriculture is a traditional farming practice where forests or grasslands are cleared by cutting down vegetation and then burning the biomass. While it quickly clears land for farming, this method also has several negative environmental impacts:
+    """)
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.subheader("Deforestation and Habitat Loss")
+        st.markdown("""
+        - Destruction of forests reduces biodiversity
+        - Disrupts ecosystems and food chains
+        - Threatens countless species of plants and animals
+        - Creates forest fragmentation
+        - Reduces wildlife corridors
+        """)
+        
+        st.subheader("Soil Degradation")
+        st.markdown("""
+        - Initial burning provides nutrients to the soil
+        - Repeated use depletes essential minerals and organic matter
+        - Nutrients often washed away by rain
+        - Leads to poor soil quality over time
+        - Increases erosion and runoff
+        """)
+    
+    with col2:
+        st.subheader("Increased Carbon Emissions")
+        st.markdown("""
+        - Burning releases carbon stored in trees and plants
+        - Contributes to greenhouse gas emissions
+        - Exacerbates global warming
+        - Reduces forest carbon sequestration capacity
+        - Creates air pollution and respiratory hazards
+        """)
+        
+        st.subheader("Challenges to Sustainability")
+        st.markdown("""
+        - Loss of soil fertility forces farmers to move to new land
+        - Continues the cycle of deforestation
+        - Disrupts ecosystems for pollinators
+        - Affects animals and plant species that depend on stable habitats
+        - Creates a cycle of unsustainable land use
+        """)
@@ -0,0 +1,73 @@
+"""Implementation page: putting agroforestry into practice."""
+import streamlit as st
+
+
+def render():
+    st.title("Practical Implementation")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.header("Implementation Steps")
+        st.markdown("""
+        **Tree Planting:**
+        - Integrate Inga trees into existing farming systems
+        - Plant in rows between crop areas
+        - Establish nurseries for Inga seedlings
+        - Maintain appropriate spacing for optimal growth
+        - Prune strategically to manage light exposure
+        
+        **Farmer Education:**
+        - Provide training on agroforestry benefits
+        - Teach sustainable farming techniques
+        - Develop demonstration plots
+        - Create farmer-to-farmer learning networks
+        - Distribute educational materials in local languages
+        """)
+    
+    with col2:
+        st.markdown("""
+        **Incentives & Policy Support:**
+        - Governments can provide subsidies for adoption
+        - NGOs can offer training programs
+        - Improve resource accessibility
+        - Develop certification programs for sustainable products
+        - Create market linkages for agroforestry products
+        """)
+    
+    st.header("Contribution to Global Food Security")
+    st.markdown("""
+    By improving soil fertility and providing shade, Inga trees can enhance crop yields in areas suffering from land degradation. This sustainable system ensures consistent food production without the need for additional land, contributing to food security for growing populations. Additionally, crops grown under agroforestry conditions are more resilient to extreme weather events, ensuring long-term agricultural productivity.
+    """)
+    
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        st.subheader("Productivity Benefits")
+        st.markdown("""
+        - Improved soil fertility
+        - Higher crop yields
+        - Reduced pest pressure
+        - Diversified farm income
+        - Sustainable long-term production
+        """)
+    
+    with col2:
+        st.subheader("Resilience Factors")
+        st.markdown("""
+        - Better drought resistance
+        - Reduced flood impact
+        - Temperature moderation
+        - Wind protection
+        - Habitat for beneficial insects
+        """)
+    
+    with col3:
+        st.subheader("Socioeconomic Impact")
+        st.markdown("""
+        - Reduced need to clear new land
+        - Lower input costs
+        - Stable agricultural livelihoods
+        - Improved food sovereignty
+        - Enhanced community resilience
+        """)
@@ -0,0 +1,41 @@
+"""Map page: the prevalence choropleth with its filters."""
+import streamlit as st
+
+import perf
+from client_map import render_client_animation, render_client_map
+from data_store import load_data, load_timeseries
+from map_view import map_view
+
+TITLE = "Global Slash-and-Burn Agriculture Prevalence"
+INTRO = """
+This application visualizes the prevalence of slash-and-burn agriculture techniques across different countries.
+The color scale ranges from white (not common) to dark blue (extremely common).
+"""
+
+
+def render(controls=st):
+    """Draw the Map page; the display toggles go into ``controls`` (``st`` or ``st.sidebar``)."""
+    # Load data
+    perf.begin("Map")
+    with perf.span("load_data"):
+        df = load_data()
+        ts = load_timeseries()
+    
+    st.title(TITLE)
+    st.markdown(INTRO)
+    
+    # Opt-in timing panel for the Map fragment
+    st.sidebar.checkbox("Show timing debug panel", key=perf.DEBUG_PANEL_KEY)
+    
+    # Client-side mode ships the data once and filters in the browser, without reruns
+    client_side = controls.toggle("Filter in browser", help="Apply region and prevalence filters without contacting the server")
+    
+    # Year animation replays precomputed per-year deltas in the browser
+    animate = ts is not None and controls.toggle("Animate over years")
+    
+    if animate:
+        render_client_animation(ts)
+    elif client_side:
+        render_client_map(df)
+    else:
+        map_view(df, ts)
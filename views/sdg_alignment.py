@@ -0,0 +1,47 @@
+"""SDG Alignment page: links to the UN Sustainable Development Goals."""
+import streamlit as st
+
+
+def render():
+    st.title("Alignment with UN Sustainable Development Goals")
+    
+    st.markdown("""
+    Agroforestry with Inga trees addresses key global challenges outlined in the United Nations Sustainable Development Goals (SDGs).
+    """)
+    
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        st.subheader("Climate Action (SDG 13)")
+        st.markdown("""
+        - Reduces deforestation
+        - Increases carbon sequestration
+        - Minimizes slash-and-burn methods
+        - Reduces agricultural carbon emissions
+        - Promotes climate-resilient farming
+        """)
+    
+    with col2:
+        st.subheader("Zero Hunger (SDG 2)")
+        st.markdown("""
+        - Improves soil health
+        - Increases crop yields
+        - Combats food insecurity
+        - Supports sustainable agriculture
+        - Enhances agricultural resilience
+        """)
+    
+    with col3:
+        st.subheader("Life on Land (SDG 15)")
+        st.markdown("""
+        - Protects forests and biodiversity
+        - Ensures ecosystem stability
+        - Promotes sustainable land use
+        - Prevents habitat fragmentation
+        - Supports habitat connectivity
+        """)
+    
+    st.header("Conclusion")
+    st.markdown("""
+    Agroforestry with Inga trees presents a practical, low-maintenance, and highly effective alternative to slash-and-burn agriculture. By restoring soil fertility, reducing deforestation, and improving crop resilience, this solution aligns with global sustainability goals while providing farmers with a viable long-term agricultural strategy. Governments, organizations, and farming communities must work together to implement and scale this approach for a more sustainable future.
+    """)
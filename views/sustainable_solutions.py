@@ -0,0 +1,88 @@
+"""Sustainable Solutions page: agroforestry with Inga trees."""
+import streamlit as st
+
+
+def render():
+    st.title("Agroforestry with Inga Trees: A Sustainable Solution")
+    
+    st.markdown("""
+    A viable alternative to slash-and-burn farming is the integration of agroforestry using Inga trees. 
+    This approach helps restore soil fertility and reduces environmental degradation.
+    """)
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.subheader("Soil Restoration")
+        st.markdown("""
+        - Inga trees naturally enrich the soil by fixing nitrogen
+        - Add organic matter through leaf mulch
+        - Reduce the need for synthetic fertilizers
+        - Create self-sustaining soil improvement system
+        - Support beneficial soil microorganisms
+        """)
+        
+        st.subheader("Moisture Retention")
+        st.markdown("""
+        - Leaves create a protective mulch layer
+        - Retains soil moisture effectively
+        - Prevents erosion during heavy rainfall
+        - Stabilizes ground temperature
+        - Reduces water requirements for crops
+        """)
+    
+    with col2:
+        st.subheader("Sustainable Land Use")
+        st.markdown("""
+        - Maintains soil health over time
+        - Eliminates need for frequent land clearing
+        - Preserves existing forests
+        - Creates permanent agricultural plots
+        - Integrates with natural ecosystem functions
+        """)
+        
+        st.subheader("Low Maintenance")
+        st.markdown("""
+        - Trees require minimal care
+        - Ideal for farmers managing extensive land areas
+        - Reduce labor requirements long-term
+        - Self-propagating once established
+        - Resilient to local conditions
+        """)
+    
+    st.header("Target Farmers for Agroforestry with Inga Trees")
+    st.markdown("""
+    The solution is particularly beneficial for:
+    - Palm oil farmers
+    - Wet rice farmers
+    - Farmers in Brazil
+    - Farmers practicing extensive agriculture (large-scale land management with minimal input requirements)
+    """)
+    
+    st.header("Agricultural Context of the Solution")
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        st.subheader("Types of Agriculture")
+        st.markdown("""
+        - Conservational Agriculture: Focuses on restoring soil health and preventing land degradation
+        - Agroforestry: Integrates trees with crops to enhance sustainability
+        """)
+    
+    with col2:
+        st.subheader("Technological Requirements")
+        st.markdown("""
+        - Low to moderate technology levels
+        - Aligns with Second Agricultural Revolution (crop rotation, selective breeding)
+        - Compatible with Green Revolution techniques (modern irrigation)
+        - Requires only basic tools for planting and maintaining Inga trees
+        """)
+    
+    with col3:
+        st.subheader("Agricultural Revolution Relevance")
+        st.markdown("""
+        - Falls under the Third Agricultural Revolution (Green Revolution)
+        - Emphasis on soil fertility and food security
+        - Focuses on sustainable intensification
+        - Reduces dependency on external inputs
+        """)
@@ -0,0 +1,128 @@
+"""Background warm-up of the shared caches.
+
+``start()`` fills the process-wide caches on a thread pool without blocking
+the server: it loads the dataset (and prevalence history), builds the filter
+index, the aggregation cube and the configured query backend, and then builds
+the default-filter figure for every region. Every step goes through the same
+cached functions the Map page calls, so the page finds the results already
+there.
+
+The entry points call ``start()`` on their first run. ``serve.py`` calls it
+before the server starts, so the first session also gets warm caches.
+"""
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import streamlit as st
+
+# Figure builds hold the GIL, so more workers would only slow down concurrent reruns
+WARMUP_WORKERS = 2
+# The Map page's default prevalence range
+DEFAULT_RANGE = (0, 100)
+
+logger = logging.getLogger("slash_burn.warmup")
+
+
+class Warmup:
+    """Progress of one warm-up run."""
+
+    def __init__(self):
+        self.finished = threading.Event()
+        self.timings = {}
+        self.errors = []
+        # {directory: signatures} of the data warmed, set by run()
+        self.snapshot = {}
+
+    def step(self, name, action, *args):
+        start = time.perf_counter()
+        try:
+            return action(*args)
+        except Exception as error:
+            # A failed step leaves its cache cold, and the page builds it on demand
+            logger.exception("warm-up step %s failed", name)
+            self.errors.append((name, error))
+        finally:
+            self.timings[name] = (time.perf_counter() - start) * 1000
+
+
+def warm_region_figure(df, region, year, signatures=None):
+    # Imported here so importing warmup stays cheap for the text pages
+    from geometry import ADMIN_CODE_COLUMN, load_geometry
+    from filter_index import FilteredRows, load_filter_index
+    from map_figure import cached_figure_spec
+    from query_backend import QUERY_BACKEND, query_filtered
+    from regions import REGION_BOUNDS
+
+    low, high = DEFAULT_RANGE
+    rows = None
+    if QUERY_BACKEND != "pandas":
+        result = query_filtered(region, low, high, year, signatures)
+        rows = FilteredRows(result) if result is not None else None
+    if rows is None:
+        rows = load_filter_index(df).rows(region, low, high, year)
+    geometry = load_geometry(REGION_BOUNDS[region]) if ADMIN_CODE_COLUMN in df.columns else None
+    # Only the cached spec is needed; decoding it into a Figure would be wasted work on a hit
+    cached_figure_spec(rows, region, low, high, geometry)
+
+
+def run(warmup, snapshot=None):
+    """Warm the caches for ``snapshot`` (``{directory: signatures}``), by default the current data."""
+    from aggregates import load_cube
+    from data_store import PREVALENCE_DIR, TIMESERIES_DIR, current_signatures, load_data, load_timeseries
+    from filter_index import load_filter_index
+    from regions import REGION_OPTIONS
+    from timeseries import years
+
+    if snapshot is None:
+        snapshot = {directory: current_signatures(directory) for directory in (PREVALENCE_DIR, TIMESERIES_DIR)}
+    warmup.snapshot = snapshot
+    prevalence, history = snapshot.get(PREVALENCE_DIR), snapshot.get(TIMESERIES_DIR)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(WARMUP_WORKERS, thread_name_prefix="warmup") as pool:
+        df = pool.submit(warmup.step, "load_data", load_data, prevalence)
+        ts = pool.submit(warmup.step, "load_timeseries", load_timeseries, history)
+        df, ts = df.result(), ts.result()
+        if df is None:
+            return
+
+        # The Map page opens on the latest year of the history, if there is one
+        year, signatures = None, prevalence
+        if ts is not None:
+            year, signatures, df = years(ts)[-1], history, ts
+
+        steps = [
+            pool.submit(warmup.step, "filter_index", load_filter_index, df),
+            pool.submit(warmup.step, "cube", load_cube, PREVALENCE_DIR, prevalence),
+        ]
+        if ts is not None:
+            steps.append(pool.submit(warmup.step, "history_cube", load_cube, TIMESERIES_DIR, history))
+        for future in steps:
+            future.result()
+
+        figures = [
+            pool.submit(warmup.step, f"figure:{region}", warm_region_figure, df, region, year, signatures)
+            for region in REGION_OPTIONS
+        ]
+        for future in figures:
+            future.result()
+    logger.info("warm-up finished in %.0f ms", (time.perf_counter() - start) * 1000)
+
+
+@st.cache_resource(show_spinner=False)
+def start():
+    """Start warming the shared caches in the background, once per process.
+
+    Returns immediately with the ``Warmup`` tracking the run.
+    """
+    warmup = Warmup()
+
+    def target():
+        try:
+            run(warmup)
+        finally:
+            warmup.finished.set()
+
+    threading.Thread(target=target, name="warmup", daemon=True).start()
+    return warmup
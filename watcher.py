@@ -0,0 +1,100 @@
+"""Background watcher that hot-reloads changed data files.
+
+A daemon thread polls the data directories every ``SLASH_BURN_WATCH_INTERVAL``
+seconds (0 disables it). When a partition is added, rewritten or removed, it
+builds the new snapshot's caches first: the frames, the filter index, the
+aggregation cube and the default figures. It then publishes the snapshot in
+one assignment. Sessions keep reading the previous snapshot until that moment,
+so no rerun waits on a reload. A snapshot whose data can't be loaded is never
+published; the next poll tries it again.
+
+The reload is incremental where the data allows it. Only changed partitions
+are read; unchanged ones come from their per-file caches. Cached figures and
+exports are keyed by the partitions their rows come from, so a filter result
+that doesn't touch a changed partition keeps its cached figure and export.
+The frame, filter index and cube combine all partitions, so they are rebuilt
+for the whole snapshot.
+"""
+import logging
+import os
+import threading
+import time
+
+import streamlit as st
+
+import warmup
+
+WATCH_INTERVAL = float(os.environ.get("SLASH_BURN_WATCH_INTERVAL", 5))
+# Warm-up steps whose failure means the snapshot can't be served at all
+REQUIRED_STEPS = ("load_data", "load_timeseries", "detections")
+
+logger = logging.getLogger("slash_burn.watcher")
+
+
+def poll():
+    """Reload and publish the data if any watched directory changed; return whether it did.
+
+    Raises if the changed data can't be loaded. The published snapshot then
+    stays in place, and the next poll tries again.
+    """
+    # Imported here so importing watcher stays cheap for the text pages
+    from data_store import (
+        DETECTIONS_DIR,
+        PREVALENCE_DIR,
+        TIMESERIES_DIR,
+        _load_frame,
+        partition_signatures,
+        publish,
+        published_snapshot,
+    )
+
+    watched = (PREVALENCE_DIR, TIMESERIES_DIR, DETECTIONS_DIR)
+    snapshot = {directory: partition_signatures(directory) for directory in watched}
+    published = published_snapshot() or {}
+    changed = [directory for directory in watched if published.get(str(directory)) != snapshot[directory]]
+    if not changed:
+        return False
+
+    start = time.perf_counter()
+    run = warmup.Warmup()
+    warmup.run(run, snapshot)
+    if snapshot[DETECTIONS_DIR]:
+        run.step("detections", _load_frame, snapshot[DETECTIONS_DIR])
+    # Warm-up steps log and swallow their errors; an unreadable snapshot must not be published
+    for name, error in run.errors:
+        if name in REQUIRED_STEPS:
+            raise RuntimeError(f"could not load the new data ({name} failed)") from error
+    publish(snapshot)
+    logger.info(
+        "published new data for %s in %.0f ms",
+        ", ".join(directory.name for directory in changed),
+        (time.perf_counter() - start) * 1000,
+    )
+    return True
+
+
+def watch(interval):
+    from data_store import DETECTIONS_DIR, partition_signatures, publish
+
+    initial = warmup.start()
+    initial.finished.wait()
+    # Publish the data the initial warm-up covered, instead of warming it a second time.
+    # Files changed since then differ from this snapshot, so the first poll still picks them up
+    publish({DETECTIONS_DIR: partition_signatures(DETECTIONS_DIR), **initial.snapshot})
+    while True:
+        time.sleep(interval)
+        try:
+            poll()
+        except Exception:
+            # Sessions keep the last published snapshot; try again next interval
+            logger.exception("data reload failed")
+
+
+@st.cache_resource(show_spinner=False)
+def start(interval=WATCH_INTERVAL):
+    """Start the watcher thread, once per process; returns it (``None`` if disabled)."""
+    if interval <= 0:
+        return None
+    thread = threading.Thread(target=watch, args=(interval,), name="data-watcher", daemon=True)
+    thread.start()
+    return thread